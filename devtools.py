@@ -0,0 +1,465 @@
+"""브라우저 원격 디버깅(DevTools)을 이용한 프로필별 탭 일괄 작업.
+
+같은 user-data-dir 의 프로필들은 하나의 브라우저 프로세스를 공유하므로 --remote-debugging-port 는
+처음 브라우저를 띄운 실행에만 적용되고 엔드포인트도 하나뿐이다. (Edge 가 이미 포트 없이 실행 중이면 플래그는 무시된다)
+그래서 브라우저 웹소켓의 Target.getTargets 로 모든 탭을 받고, 각 탭의 browserContextId(= 프로필)로 나눠
+profile_id → browserContextId 매핑에 있는 프로필의 탭에만 작업한다. 매핑은 실행 직후 새로 생긴 탭의
+컨텍스트로 만든다 (new_context). 작업은 프로필별로 동시에 실행되며 탭 목록은 TabIndex 에 캐시된다.
+
+표준 라이브러리만 사용하며 FakeDevToolsServer 로 브라우저 없이 시험할 수 있다:
+    python devtools.py demo --profiles 5
+"""
+import os
+import re
+import sys
+import json
+import time
+import base64
+import socket
+import struct
+import fnmatch
+import argparse
+import hashlib
+import threading
+import socketserver
+import urllib.request
+from urllib.parse import urlparse
+from http.server import BaseHTTPRequestHandler
+from concurrent.futures import ThreadPoolExecutor
+
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+class DevToolsError(Exception):
+    pass
+
+# ==========================================
+# 최소 웹소켓 클라이언트 (RFC 6455, 텍스트 프레임만)
+# ==========================================
+def _recv_exact(sock, n):
+    buf = bytearray()
+    while len(buf) < n:
+        chunk = sock.recv(n - len(buf))
+        if not chunk: raise ConnectionError("웹소켓 연결 끊김")
+        buf += chunk
+    return bytes(buf)
+
+def ws_send(sock, text, mask=True, opcode=0x1):
+    payload = text.encode('utf-8') if isinstance(text, str) else text
+    n = len(payload)
+    header = bytearray([0x80 | opcode])
+    mask_bit = 0x80 if mask else 0
+    if n < 126: header.append(mask_bit | n)
+    elif n < 1 << 16: header += bytes([mask_bit | 126]) + struct.pack('>H', n)
+    else: header += bytes([mask_bit | 127]) + struct.pack('>Q', n)
+    if mask:
+        key = os.urandom(4)
+        payload = bytes(b ^ key[i % 4] for i, b in enumerate(payload))
+        header += key
+    sock.sendall(bytes(header) + payload)
+
+def ws_recv(sock):
+    """텍스트 메시지 하나 수신 (조각 프레임 합침, ping 은 pong 응답). 상대가 닫으면 None"""
+    message = bytearray()
+    while True:
+        b0, b1 = _recv_exact(sock, 2)
+        opcode, n = b0 & 0x0F, b1 & 0x7F
+        if n == 126: n = struct.unpack('>H', _recv_exact(sock, 2))[0]
+        elif n == 127: n = struct.unpack('>Q', _recv_exact(sock, 8))[0]
+        key = _recv_exact(sock, 4) if b1 & 0x80 else None
+        data = _recv_exact(sock, n)
+        if key: data = bytes(b ^ key[i % 4] for i, b in enumerate(data))
+        if opcode == 0x8: return None
+        if opcode == 0x9:
+            ws_send(sock, data, mask=key is None, opcode=0xA)
+            continue
+        if opcode == 0xA: continue
+        message += data
+        if b0 & 0x80: return message.decode('utf-8')
+
+class DevToolsSession:
+    """탭 하나의 CDP 웹소켓 세션"""
+    def __init__(self, ws_url, timeout=5.0):
+        parsed = urlparse(ws_url)
+        self.sock = socket.create_connection((parsed.hostname, parsed.port or 80), timeout=timeout)
+        key = base64.b64encode(os.urandom(16)).decode()
+        request = (f"GET {parsed.path or '/'} HTTP/1.1\r\nHost: {parsed.hostname}:{parsed.port}\r\n"
+                   f"Upgrade: websocket\r\nConnection: Upgrade\r\nSec-WebSocket-Key: {key}\r\n"
+                   f"Sec-WebSocket-Version: 13\r\n\r\n")
+        self.sock.sendall(request.encode())
+        response = b""
+        while b"\r\n\r\n" not in response:
+            chunk = self.sock.recv(1024)
+            if not chunk: raise DevToolsError("웹소켓 핸드셰이크 실패 (연결 끊김)")
+            response += chunk
+        head = response.split(b"\r\n\r\n", 1)[0].decode('latin-1')
+        expected = base64.b64encode(hashlib.sha1((key + WS_GUID).encode()).digest()).decode()
+        if " 101 " not in head.split("\r\n", 1)[0] or expected not in head:
+            self.sock.close()
+            raise DevToolsError(f"웹소켓 핸드셰이크 거부: {head.splitlines()[0] if head else '-'}")
+        self.next_id = 0
+
+    def call(self, method, **params):
+        self.next_id += 1
+        msg_id = self.next_id
+        ws_send(self.sock, json.dumps({'id': msg_id, 'method': method, 'params': params}))
+        while True:
+            raw = ws_recv(self.sock)
+            if raw is None: raise DevToolsError("세션이 닫힘")
+            resp = json.loads(raw)
+            if resp.get('id') != msg_id: continue   # 이벤트 등은 무시
+            if 'error' in resp: raise DevToolsError(resp['error'].get('message', str(resp['error'])))
+            return resp.get('result', {})
+
+    def close(self):
+        try:
+            ws_send(self.sock, b"", opcode=0x8)
+            self.sock.close()
+        except OSError: pass
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): self.close()
+
+# ==========================================
+# 탭 목록 캐시
+# ==========================================
+def http_json(url, timeout=3.0, method='GET'):
+    req = urllib.request.Request(url, method=method)
+    with urllib.request.urlopen(req, timeout=timeout) as resp:
+        body = resp.read().decode('utf-8', errors='replace')
+    try: return json.loads(body)
+    except ValueError: return body
+
+def page_targets(endpoint, timeout=3.0):
+    """브라우저 전체의 page 타겟 [{id, url, title, context, ws}]. 디버깅 포트가 없으면 OSError"""
+    version = http_json(f"http://{endpoint}/json/version", timeout=timeout)
+    browser_ws = version.get('webSocketDebuggerUrl') if isinstance(version, dict) else None
+    if not browser_ws: raise DevToolsError("브라우저 웹소켓 주소를 찾을 수 없음")
+    with DevToolsSession(browser_ws, timeout=timeout) as session:
+        infos = session.call('Target.getTargets').get('targetInfos', [])
+    return [{'id': t['targetId'], 'url': t.get('url', ''), 'title': t.get('title', ''),
+             'context': t.get('browserContextId'), 'ws': f"ws://{endpoint}/devtools/page/{t['targetId']}"}
+            for t in infos if t.get('type') == 'page']
+
+def new_context(before, after):
+    """실행 전후 타겟 목록을 비교해 새 탭들이 속한 컨텍스트가 하나뿐이면 그 id, 아니면 None"""
+    seen = {t['id'] for t in before}
+    contexts = {t['context'] for t in after if t['id'] not in seen and t['context']}
+    return contexts.pop() if len(contexts) == 1 else None
+
+class TabIndex:
+    """프로필별 탭 목록 캐시. apply 는 새로 받은 목록과 비교해 추가/삭제/변경된 탭만 반영하고,
+    TabManager 는 캐시가 충분히 새로우면 Target.getTargets 를 다시 요청하지 않는다."""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}   # profile_id → {'tabs': {id: tab}, 'updated': t}
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return dict(entry['tabs']) if entry else {}
+
+    def updated(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry['updated'] if entry else None
+
+    def apply(self, key, targets):
+        fresh = {t['id']: dict(t) for t in targets}
+        with self.lock:
+            entry = self.entries.setdefault(key, {'tabs': {}, 'updated': 0.0})
+            tabs = entry['tabs']
+            added = [i for i in fresh if i not in tabs]
+            removed = [i for i in tabs if i not in fresh]
+            changed = [i for i in fresh if i in tabs and tabs[i] != fresh[i]]
+            for i in removed: del tabs[i]
+            for i in added + changed: tabs[i] = fresh[i]
+            entry['updated'] = time.time()
+        return {'added': added, 'removed': removed, 'changed': changed}
+
+    def forget(self, key, tab_ids):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry:
+                for i in tab_ids: entry['tabs'].pop(i, None)
+
+# ==========================================
+# 프로필별 탭 일괄 작업
+# ==========================================
+def url_matcher(pattern):
+    """'re:' 로 시작하면 정규식, * ? 가 있으면 와일드카드, 아니면 부분 문자열. 잘못된 정규식은 ValueError"""
+    if pattern.startswith('re:'):
+        try: rx = re.compile(pattern[3:])
+        except re.error as e: raise ValueError(f"잘못된 정규식 '{pattern[3:]}': {e}") from None
+        return lambda url: bool(rx.search(url))
+    if any(ch in pattern for ch in '*?['):
+        return lambda url: fnmatch.fnmatchcase(url, pattern)
+    return lambda url: pattern in url
+
+class TabManager:
+    """한 브라우저 엔드포인트('host:port')에서 contexts(profile_id → browserContextId)의 프로필별로 탭 작업을 동시에 수행.
+    매핑에 없는 컨텍스트(다른 프로필, 그룹 밖 프로필)의 탭은 건드리지 않는다."""
+    def __init__(self, endpoint, contexts, index=None, max_workers=16, timeout=3.0):
+        self.endpoint = endpoint
+        self.contexts = dict(contexts)
+        self.index = index or TabIndex()
+        self.timeout = timeout
+        self.refresh_lock = threading.Lock()
+        self.found = None   # 이 매니저에서 마지막으로 받은 목록에 탭이 있던 프로필 (아직 안 받았으면 None)
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def close(self):
+        self.pool.shutdown(wait=False)
+
+    def _fan_out(self, fn):
+        futures = {pid: self.pool.submit(self._guarded, fn, pid) for pid in sorted(self.contexts)}
+        return {pid: fut.result() for pid, fut in futures.items()}
+
+    def _guarded(self, fn, pid):
+        start = time.perf_counter()
+        try: res = {'ok': True, **fn(pid)}
+        except (OSError, ValueError, DevToolsError) as e: res = {'ok': False, 'error': str(e) or type(e).__name__}
+        res['latency_ms'] = (time.perf_counter() - start) * 1000
+        return res
+
+    def _refresh(self, fresh_after):
+        """fresh_after 시각 이후에 갱신되지 않은 프로필이 있으면 타겟 목록을 한 번 받아 모든 프로필에 나눠 반영.
+        잠금 안에서 판단하므로 동시에 호출한 작업들은 먼저 들어간 쪽이 받은 목록을 같이 쓴다."""
+        with self.refresh_lock:
+            stamps = [self.index.updated(pid) for pid in self.contexts]
+            if self.found is not None and all(t is not None and t >= fresh_after for t in stamps): return
+            by_context = {}
+            for t in page_targets(self.endpoint, timeout=self.timeout): by_context.setdefault(t['context'], []).append(t)
+            self.found = {pid for pid, ctx in self.contexts.items() if ctx in by_context}
+            for pid, ctx in self.contexts.items(): self.index.apply(pid, by_context.get(ctx, []))
+
+    def _tabs(self, pid, max_age=None, fresh_after=None):
+        self._refresh(fresh_after if fresh_after is not None else time.time() - max_age)
+        if pid not in self.found: raise DevToolsError("이 프로필의 탭을 찾을 수 없음 (브라우저가 재시작됐다면 런처로 다시 실행)")
+        return self.index.get(pid)
+
+    def list_tabs(self, max_age=2.0):
+        return self._fan_out(lambda pid: {'tabs': list(self._tabs(pid, max_age).values())})
+
+    def close_matching(self, pattern):
+        match = url_matcher(pattern)
+        # 작업 시작 이후의 목록이면 충분하므로 첫 작업자가 한 번만 받고 나머지는 캐시에서 컨텍스트별로 거른다
+        started = time.time()
+        def op(pid):
+            closed = []
+            for tab in self._tabs(pid, fresh_after=started).values():
+                if match(tab['url']):
+                    http_json(f"http://{self.endpoint}/json/close/{tab['id']}", timeout=self.timeout)
+                    closed.append(tab['id'])
+            self.index.forget(pid, closed)
+            return {'closed': closed}
+        return self._fan_out(op)
+
+    def _each_session(self, pid, action, max_age=1.0):
+        done, failed = [], []
+        for tab in self._tabs(pid, max_age).values():
+            if not tab['ws']: continue
+            try:
+                with DevToolsSession(tab['ws'], timeout=self.timeout) as session:
+                    if action(session, tab): done.append(tab['id'])
+            except (OSError, DevToolsError) as e:
+                failed.append({'id': tab['id'], 'error': str(e)})
+        return done, failed
+
+    def reload_all(self, ignore_cache=False):
+        def op(pid):
+            done, failed = self._each_session(pid, lambda s, t: s.call('Page.reload', ignoreCache=ignore_cache) is not None)
+            return {'reloaded': done, 'failed': failed}
+        return self._fan_out(op)
+
+    def freeze_background(self):
+        """보이지 않는(백그라운드) 탭을 frozen 상태로 전환해 타이머/스크립트 실행을 멈춘다 (CPU 절약).
+        탭을 버리는(discard) 것이 아니므로 메모리는 그대로 남는다."""
+        def freeze(session, tab):
+            state = session.call('Runtime.evaluate', expression='document.visibilityState', returnByValue=True)
+            if state.get('result', {}).get('value') != 'hidden': return False
+            session.call('Page.setWebLifecycleState', state='frozen')
+            return True
+        def op(pid):
+            done, failed = self._each_session(pid, freeze)
+            return {'frozen': done, 'failed': failed}
+        return self._fan_out(op)
+
+# ==========================================
+# 시험용 가짜 DevTools 서버
+# ==========================================
+class _FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args): pass
+
+    def _send_json(self, obj, status=200):
+        body = json.dumps(obj).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        fake = self.server.fake
+        if self.headers.get('Upgrade', '').lower() == 'websocket': return self._websocket(fake)
+        if self.path == '/json/list' or self.path == '/json':
+            fake.list_calls += 1
+            return self._send_json(fake.target_list())
+        if self.path == '/json/version':
+            return self._send_json({'Browser': 'FakeEdge/1.0', 'webSocketDebuggerUrl': f"ws://{fake.endpoint}/devtools/browser/{fake.browser_id}"})
+        m = re.match(r'^/json/close/(.+)$', self.path)
+        if m:
+            with fake.lock: existed = fake.tabs.pop(m.group(1), None)
+            body = b"Target is closing" if existed else b"No such target id"
+            self.send_response(200 if existed else 404)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            return self.wfile.write(body)
+        self._send_json({'error': 'not found'}, 404)
+
+    do_PUT = do_GET
+
+    def _websocket(self, fake):
+        tab_id = self.path.rsplit('/', 1)[-1]
+        if tab_id != fake.browser_id and tab_id not in fake.tabs:
+            self.send_response(404); self.send_header("Content-Length", "0"); self.end_headers()
+            return
+        accept = base64.b64encode(hashlib.sha1((self.headers['Sec-WebSocket-Key'] + WS_GUID).encode()).digest()).decode()
+        self.send_response(101)
+        self.send_header("Upgrade", "websocket")
+        self.send_header("Connection", "Upgrade")
+        self.send_header("Sec-WebSocket-Accept", accept)
+        self.end_headers()
+        self.close_connection = True
+        sock = self.connection
+        while True:
+            try: raw = ws_recv(sock)
+            except (OSError, ConnectionError): return
+            if raw is None: return
+            req = json.loads(raw)
+            result = fake.handle_cdp(tab_id, req.get('method'), req.get('params') or {})
+            reply = {'id': req['id'], 'error': {'message': result}} if isinstance(result, str) else {'id': req['id'], 'result': result}
+            ws_send(sock, json.dumps(reply), mask=False)
+
+class _FakeServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class FakeDevToolsServer:
+    """여러 프로필(컨텍스트)을 가진 브라우저 하나를 흉내냄: /json/version, /json/close/<id>,
+    브라우저 웹소켓(Target.getTargets), 탭별 웹소켓(Page.reload, Runtime.evaluate, Page.setWebLifecycleState)"""
+    def __init__(self, port=0):
+        self.lock = threading.Lock()
+        self.tabs = {}
+        self.browser_id = "FAKE-BROWSER"
+        self.list_calls = 0
+        self.server = _FakeServer(('127.0.0.1', port), _FakeHandler)
+        self.server.fake = self
+
+    def add_context(self, context, urls):
+        for i, url in enumerate(urls): self.add_tab(url, context, visible=(i == 0))
+
+    @property
+    def endpoint(self):
+        return f"127.0.0.1:{self.server.server_address[1]}"
+
+    def add_tab(self, url, context, visible=False):
+        tab_id = hashlib.md5(f"{url}{len(self.tabs)}{time.time()}".encode()).hexdigest()[:16].upper()
+        with self.lock:
+            self.tabs[tab_id] = {'url': url, 'title': url, 'context': context, 'visible': visible, 'reloads': 0, 'state': 'active'}
+        return tab_id
+
+    def target_list(self):
+        with self.lock:
+            return [{'id': i, 'type': 'page', 'url': t['url'], 'title': t['title'],
+                     'webSocketDebuggerUrl': f"ws://{self.endpoint}/devtools/page/{i}"} for i, t in self.tabs.items()]
+
+    def handle_cdp(self, tab_id, method, params):
+        with self.lock:
+            if tab_id == self.browser_id:
+                if method != 'Target.getTargets': return f"'{method}' wasn't found"
+                self.list_calls += 1
+                return {'targetInfos': [{'targetId': i, 'type': 'page', 'url': t['url'], 'title': t['title'],
+                                         'browserContextId': t['context'], 'attached': False} for i, t in self.tabs.items()]}
+            tab = self.tabs.get(tab_id)
+            if tab is None: return "No such target"
+            if method == 'Page.reload': tab['reloads'] += 1; return {}
+            if method == 'Runtime.evaluate':
+                return {'result': {'type': 'string', 'value': 'visible' if tab['visible'] else 'hidden'}}
+            if method == 'Page.setWebLifecycleState': tab['state'] = params.get('state'); return {}
+        return f"'{method}' wasn't found"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+# ==========================================
+# CLI
+# ==========================================
+def summarize(results, key):
+    lines = []
+    for pid, res in sorted(results.items()):
+        body = f"{len(res.get(key, []))}" if res['ok'] else f"❌ {res['error']}"
+        lines.append(f"Profile {pid!s:<4} {res['latency_ms']:7.1f}ms  {key}: {body}")
+    return "\n".join(lines)
+
+def run_demo(profiles, tabs_per_profile):
+    server = FakeDevToolsServer().start()
+    for pid in range(1, profiles + 1):
+        server.add_context(f"CTX{pid}", [f"https://example.com/{pid}/{t}" for t in range(tabs_per_profile)])
+    # 마지막 프로필은 매핑에서 빼서 범위 밖 탭이 건드려지지 않는지 확인
+    manager = TabManager(server.endpoint, {pid: f"CTX{pid}" for pid in range(1, profiles)})
+    try:
+        print("# list"); print(summarize(manager.list_tabs(), 'tabs'))
+        manager.list_tabs()
+        print(f"# 캐시 재사용: Target.getTargets 호출 {server.list_calls}회 (프로필 {profiles - 1}개)")
+        print("# close */1"); print(summarize(manager.close_matching('*/1'), 'closed'))
+        print("# reload"); print(summarize(manager.reload_all(), 'reloaded'))
+        print("# freeze"); print(summarize(manager.freeze_background(), 'frozen'))
+        outside = [t for t in server.tabs.values() if t['context'] == f"CTX{profiles}"]
+        print(f"# 범위 밖 Profile {profiles}: 탭 {len(outside)}/{tabs_per_profile}개 유지, "
+              f"새로고침 {sum(t['reloads'] for t in outside)}회, 동결 {sum(t['state'] != 'active' for t in outside)}개")
+    finally:
+        manager.close()
+        server.stop()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="프로필별 탭 일괄 작업 (DevTools)")
+    ap.add_argument('--port', type=int, default=9300)
+    sub = ap.add_subparsers(dest='command', required=True)
+    sub.add_parser('contexts', help="컨텍스트(프로필)별 탭 수")
+    for name in ('list', 'reload', 'freeze'):
+        p = sub.add_parser(name); p.add_argument('contexts', help="browserContextId, 쉼표로 구분")
+    p = sub.add_parser('close'); p.add_argument('contexts'); p.add_argument('pattern')
+    p = sub.add_parser('demo'); p.add_argument('--profiles', type=int, default=5); p.add_argument('--tabs', type=int, default=4)
+    args = ap.parse_args(argv)
+
+    if args.command == 'demo':
+        run_demo(args.profiles, args.tabs)
+        return 0
+    endpoint = f"127.0.0.1:{args.port}"
+    if args.command == 'contexts':
+        by_context = {}
+        for t in page_targets(endpoint): by_context.setdefault(t['context'], []).append(t)
+        for ctx, tabs in sorted(by_context.items(), key=lambda kv: str(kv[0])):
+            print(f"{ctx}  탭 {len(tabs)}개  예: {tabs[0]['url']}")
+        return 0
+    manager = TabManager(endpoint, {ctx: ctx for ctx in filter(None, args.contexts.split(','))})
+    if args.command == 'list':
+        results = manager.list_tabs()
+        for ctx, res in sorted(results.items()):
+            if not res['ok']: print(f"{ctx}: ❌ {res['error']}"); continue
+            for tab in res['tabs']: print(f"{ctx}: {tab['url']}")
+    elif args.command == 'close': print(summarize(manager.close_matching(args.pattern), 'closed'))
+    elif args.command == 'reload': print(summarize(manager.reload_all(), 'reloaded'))
+    else: print(summarize(manager.freeze_background(), 'frozen'))
+    manager.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
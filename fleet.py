@@ -0,0 +1,385 @@
+"""여러 PC의 런처를 TCP로 묶어 제어하는 컨트롤 플레인.
+
+각 PC의 런처는 FleetAgent 를 띄우고, 코디네이터(FleetCoordinator)가 모든 에이전트에
+동시에 명령을 보내 호스트별 결과/지연시간을 모은다.
+프로토콜: 한 줄당 JSON 하나 (요청 {"id", "cmd", "args", "token"} → 응답 {"id", "ok", "result"|"error"})
+
+이 모듈은 표준 라이브러리만 사용하므로 SimulatedBackend 로 리눅스 한 대에서도 돌려볼 수 있다:
+    python fleet.py demo --agents 3
+    python fleet.py agent --port 47801
+    python fleet.py status 127.0.0.1:47801 127.0.0.1:47802
+"""
+import sys
+import hmac
+import time
+import json
+import socket
+import ipaddress
+import argparse
+import threading
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_PORT = 47800
+PROTOCOL_VERSION = 1
+IDEMPOTENT_COMMANDS = ('ping', 'status')
+MAX_LINE = 1 << 20
+
+class FleetError(Exception):
+    pass
+
+# ==========================================
+# 백엔드 (에이전트가 실제로 명령을 수행하는 대상)
+# ==========================================
+class SimulatedBackend:
+    """실제 브라우저 없이 프로필 실행/종료/전송을 흉내내는 메모리 백엔드 (테스트/벤치마크용)"""
+    def __init__(self, name="sim", capacity=100, latency=0.0):
+        self.name = name
+        self.capacity = capacity
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.running = set()
+        self.broadcasts = []
+
+    def _delay(self):
+        if self.latency: time.sleep(self.latency)
+
+    def list_profiles(self):
+        with self.lock: return sorted(self.running)
+
+    def launch(self, ids):
+        self._delay()
+        with self.lock:
+            launched, failed = [], []
+            for pid in ids:
+                if pid in self.running: launched.append(pid)
+                elif len(self.running) < self.capacity:
+                    self.running.add(pid); launched.append(pid)
+                else: failed.append(pid)
+            return {'launched': launched, 'failed': failed}
+
+    def close(self, ids):
+        self._delay()
+        with self.lock:
+            closed = [pid for pid in ids if pid in self.running]
+            self.running.difference_update(closed)
+            return {'closed': closed}
+
+    def broadcast(self, action, kwargs):
+        self._delay()
+        with self.lock:
+            self.broadcasts.append((action, kwargs))
+            return {'action': action, 'targets': len(self.running)}
+
+# ==========================================
+# 에이전트 (각 PC에서 실행)
+# ==========================================
+class _AgentHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        agent = self.server.agent
+        while True:
+            line = self.rfile.readline(MAX_LINE)
+            if not line: return
+            try:
+                req = json.loads(line)
+                if not isinstance(req, dict): raise ValueError("요청이 객체가 아님")
+            except ValueError as e:
+                self._reply({'id': None, 'ok': False, 'error': f"잘못된 요청: {e}"})
+                continue
+            self._reply(agent.dispatch(req))
+
+    def _reply(self, resp):
+        self.wfile.write(json.dumps(resp, ensure_ascii=False).encode('utf-8') + b"\n")
+        self.wfile.flush()
+
+class _AgentServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def is_loopback(host):
+    if host == 'localhost': return True
+    try: return ipaddress.ip_address(host).is_loopback
+    except ValueError: return False
+
+class FleetAgent:
+    """TCP 에이전트. 기본은 127.0.0.1 에만 바인딩하며, 루프백이 아닌 주소는 token 없이 열 수 없다"""
+    def __init__(self, backend, host='127.0.0.1', port=DEFAULT_PORT, token=None, name=None):
+        if not token and not is_loopback(host):
+            raise FleetError(f"{host} 에 공개하려면 token 이 필요합니다 (텍스트/URL/실행 제어가 네트워크에 노출됨)")
+        self.backend = backend
+        self.token = token
+        self.name = name or socket.gethostname()
+        self.server = _AgentServer((host, port), _AgentHandler)
+        self.server.agent = self
+        self.thread = None
+
+    @property
+    def address(self):
+        host, port = self.server.server_address[:2]
+        return f"{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def dispatch(self, req):
+        rid = req.get('id')
+        if self.token and not hmac.compare_digest(str(req.get('token') or '').encode('utf-8'), str(self.token).encode('utf-8')):
+            return {'id': rid, 'ok': False, 'error': "인증 실패"}
+        cmd, args = req.get('cmd'), req.get('args') or {}
+        try:
+            if cmd == 'ping': result = {'name': self.name, 'version': PROTOCOL_VERSION}
+            elif cmd == 'status': result = {'name': self.name, 'profiles': self.backend.list_profiles()}
+            elif cmd == 'launch': result = self.backend.launch([int(p) for p in args.get('ids', [])])
+            elif cmd == 'close': result = self.backend.close([int(p) for p in args.get('ids', [])])
+            elif cmd == 'broadcast': result = self.backend.broadcast(str(args.get('action', '')), args.get('kwargs') or {})
+            else: return {'id': rid, 'ok': False, 'error': f"알 수 없는 명령: {cmd}"}
+        except Exception as e:
+            return {'id': rid, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        return {'id': rid, 'ok': True, 'result': result}
+
+# ==========================================
+# 코디네이터 (여러 에이전트에 동시 전송)
+# ==========================================
+def parse_address(addr):
+    host, _, port = addr.rpartition(':')
+    if not host: host, port = addr, DEFAULT_PORT
+    return host, int(port)
+
+class AgentClient:
+    """에이전트 하나에 대한 지속 연결. 끊기면 다음 요청 때 한 번 재연결"""
+    def __init__(self, address, token=None, timeout=5.0):
+        self.address = address
+        self.host, self.port = parse_address(address)
+        self.token = token
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock = None
+        self.reader = None
+        self.next_id = 0
+
+    def _connect(self):
+        self.sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile('rb')
+
+    def close(self):
+        with self.lock: self._drop()
+
+    def _drop(self):
+        try:
+            if self.reader: self.reader.close()
+            if self.sock: self.sock.close()
+        except OSError: pass
+        self.sock = self.reader = None
+
+    def request(self, cmd, **args):
+        with self.lock:
+            self.next_id += 1
+            payload = json.dumps({'id': self.next_id, 'cmd': cmd, 'args': args, 'token': self.token}).encode('utf-8') + b"\n"
+            while True:
+                reused = self.sock is not None
+                sent = False
+                try:
+                    if not reused: self._connect()
+                    self.sock.sendall(payload)
+                    sent = True
+                    line = self.reader.readline(MAX_LINE)
+                    if not line: raise ConnectionError("연결 끊김")
+                    break
+                except OSError as e:
+                    self._drop()
+                    # 오래된 연결이 이미 끊겨 있던 경우(전송 실패, 또는 응답 없이 바로 EOF)에만 새 연결로 한 번 더 시도.
+                    # 타임아웃은 에이전트가 이미 실행 중일 수 있으므로 상태를 바꾸는 명령은 다시 보내지 않는다
+                    stale = not sent or isinstance(e, ConnectionError)
+                    if isinstance(e, socket.timeout) and cmd in IDEMPOTENT_COMMANDS: stale = True
+                    if not (reused and stale): raise
+            resp = json.loads(line)
+        if not resp.get('ok'): raise FleetError(resp.get('error', '알 수 없는 오류'))
+        return resp.get('result')
+
+class FleetCoordinator:
+    """모든 에이전트에 명령을 동시에 보내고 호스트별 {ok, result|error, latency_ms} 를 돌려준다.
+    status/launch/close 결과로 '어느 프로필이 어느 호스트에서 실행 중인지' 집계 뷰를 유지한다."""
+    def __init__(self, addresses, token=None, timeout=5.0):
+        self.clients = {addr: AgentClient(addr, token=token, timeout=timeout) for addr in addresses}
+        self.pool = ThreadPoolExecutor(max_workers=max(4, len(self.clients)))
+        self.lock = threading.Lock()
+        self.view = {addr: {'ok': False, 'profiles': [], 'latency_ms': None, 'updated': None, 'error': None} for addr in addresses}
+
+    def close(self):
+        for client in self.clients.values(): client.close()
+        self.pool.shutdown(wait=False)
+
+    def _call(self, addr, cmd, args):
+        start = time.perf_counter()
+        try:
+            result = self.clients[addr].request(cmd, **args)
+            return {'ok': True, 'result': result, 'latency_ms': (time.perf_counter() - start) * 1000}
+        except (OSError, ValueError, FleetError) as e:
+            return {'ok': False, 'error': str(e) or type(e).__name__, 'latency_ms': (time.perf_counter() - start) * 1000}
+
+    def fan_out(self, cmd, per_host_args=None, **args):
+        """per_host_args 가 있으면 해당 호스트에만 각자의 인자로, 없으면 모든 호스트에 같은 인자로 전송"""
+        targets = per_host_args if per_host_args is not None else {addr: args for addr in self.clients}
+        futures = {addr: self.pool.submit(self._call, addr, cmd, a) for addr, a in targets.items()}
+        return {addr: f.result() for addr, f in futures.items()}
+
+    def _update_view(self, addr, res, profiles=None, added=(), removed=()):
+        with self.lock:
+            v = self.view[addr]
+            v['latency_ms'] = res['latency_ms']
+            v['ok'] = res['ok']
+            v['error'] = res.get('error')
+            if not res['ok']: return
+            v['updated'] = time.time()
+            current = set(v['profiles']) if profiles is None else set(profiles)
+            v['profiles'] = sorted((current | set(added)) - set(removed))
+
+    def refresh(self):
+        results = self.fan_out('status')
+        for addr, res in results.items():
+            self._update_view(addr, res, profiles=res['result']['profiles'] if res['ok'] else None)
+        return results
+
+    def launch(self, plan):
+        """plan: {주소: [프로필 ID, ...]}. 실제로 실행된 'launched' 만 집계 뷰에 넣고,
+        접수만 된 'queued' 는 다음 refresh() 에서 반영된다"""
+        results = self.fan_out('launch', {addr: {'ids': list(ids)} for addr, ids in plan.items()})
+        for addr, res in results.items():
+            self._update_view(addr, res, added=res['result']['launched'] if res['ok'] else ())
+        return results
+
+    def spread(self, ids):
+        """프로필 ID 목록을 현재 실행 수가 적은 호스트부터 채우는 배치 계획 생성.
+        refresh() 로 응답을 확인한 호스트에만 배치한다"""
+        with self.lock:
+            load = {addr: len(v['profiles']) for addr, v in self.view.items() if v['ok']}
+        if ids and not load: raise FleetError("응답하는 에이전트가 없음 (refresh 먼저 실행)")
+        plan = {addr: [] for addr in load}
+        for pid in ids:
+            addr = min(load, key=lambda a: (load[a], a))
+            plan[addr].append(pid); load[addr] += 1
+        return {addr: ids for addr, ids in plan.items() if ids}
+
+    def close_profiles(self, plan):
+        results = self.fan_out('close', {addr: {'ids': list(ids)} for addr, ids in plan.items()})
+        for addr, res in results.items():
+            self._update_view(addr, res, removed=res['result']['closed'] if res['ok'] else ())
+        return results
+
+    def broadcast(self, action, **kwargs):
+        return self.fan_out('broadcast', action=action, kwargs=kwargs)
+
+    def where(self, profile_id):
+        with self.lock:
+            return [addr for addr, v in self.view.items() if profile_id in v['profiles']]
+
+    def placement(self):
+        """프로필 ID → 실행 중인 호스트 목록"""
+        out = {}
+        with self.lock:
+            for addr, v in self.view.items():
+                for pid in v['profiles']: out.setdefault(pid, []).append(addr)
+        return out
+
+# ==========================================
+# CLI
+# ==========================================
+def parse_ids(text):
+    """'1-5,8,10' → [1, 2, 3, 4, 5, 8, 10]"""
+    ids = []
+    for part in filter(None, text.split(',')):
+        lo, _, hi = part.partition('-')
+        ids.extend(range(int(lo), int(hi or lo) + 1))
+    return ids
+
+def format_results(results):
+    lines = []
+    for addr, res in sorted(results.items()):
+        body = json.dumps(res['result'], ensure_ascii=False) if res['ok'] else f"❌ {res['error']}"
+        lines.append(f"{addr:<22} {res['latency_ms']:7.1f}ms  {body}")
+    return "\n".join(lines)
+
+def run_demo(agent_count, profiles):
+    agents = [FleetAgent(SimulatedBackend(name=f"sim{i}", capacity=40, latency=0.02), port=0, name=f"sim{i}").start()
+              for i in range(agent_count)]
+    coord = FleetCoordinator([a.address for a in agents])
+    try:
+        print("# status"); print(format_results(coord.refresh()))
+        plan = coord.spread(list(range(1, profiles + 1)))
+        print("# launch"); print(format_results(coord.launch(plan)))
+        print("# broadcast"); print(format_results(coord.broadcast('url', url='https://example.com', new_tab=False)))
+        placement = coord.placement()
+        print(f"# placement: {len(placement)}개 프로필 / {len(agents)}개 호스트")
+        for pid in sorted(placement)[:5]: print(f"  Profile {pid}: {', '.join(placement[pid])}")
+    finally:
+        coord.close()
+        for a in agents: a.stop()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Edge Multi-Launcher 멀티 호스트 제어")
+    ap.add_argument('--token', default=None)
+    sub = ap.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('agent', help="시뮬레이션 에이전트 실행")
+    p.add_argument('--host', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=DEFAULT_PORT)
+    p.add_argument('--capacity', type=int, default=100)
+
+    p = sub.add_parser('status'); p.add_argument('hosts', nargs='+')
+    p = sub.add_parser('launch', help="host:port=1-10 형식")
+    p.add_argument('plan', nargs='+')
+    p = sub.add_parser('close', help="host:port=1-10 형식")
+    p.add_argument('plan', nargs='+')
+    p = sub.add_parser('broadcast')
+    p.add_argument('action', choices=['url', 'text', 'key', 'f12'])
+    p.add_argument('hosts', nargs='+')
+    p.add_argument('--url'); p.add_argument('--text'); p.add_argument('--key')
+    p.add_argument('--new-tab', action='store_true'); p.add_argument('--enter', action='store_true')
+
+    p = sub.add_parser('demo', help="로컬 시뮬레이션 에이전트 여러 개로 전체 흐름 실행")
+    p.add_argument('--agents', type=int, default=3)
+    p.add_argument('--profiles', type=int, default=60)
+
+    args = ap.parse_args(argv)
+    if args.command == 'agent':
+        try: agent = FleetAgent(SimulatedBackend(capacity=args.capacity), host=args.host, port=args.port, token=args.token).start()
+        except FleetError as e: ap.error(str(e))
+        print(f"에이전트 실행 중: {agent.address} (Ctrl+C 종료)")
+        try:
+            while True: time.sleep(3600)
+        except KeyboardInterrupt: agent.stop()
+        return 0
+    if args.command == 'demo':
+        run_demo(args.agents, args.profiles)
+        return 0
+
+    if args.command in ('launch', 'close'):
+        plan = {}
+        for item in args.plan:
+            addr, _, ids = item.partition('=')
+            plan[addr] = parse_ids(ids)
+        coord = FleetCoordinator(list(plan), token=args.token)
+        results = coord.launch(plan) if args.command == 'launch' else coord.close_profiles(plan)
+    else:
+        coord = FleetCoordinator(args.hosts, token=args.token)
+        if args.command == 'status': results = coord.refresh()
+        else:
+            required = {'url': 'url', 'text': 'text', 'key': 'key'}.get(args.action)
+            if required and not getattr(args, required): ap.error(f"broadcast {args.action} 에는 --{required} 가 필요합니다")
+            kwargs = {'url': args.url, 'new_tab': args.new_tab} if args.action == 'url' else \
+                     {'text': args.text, 'send_enter': args.enter} if args.action == 'text' else \
+                     {'key_combo': args.key} if args.action == 'key' else {}
+            results = coord.broadcast(args.action, **kwargs)
+    print(format_results(results))
+    coord.close()
+    return 0 if all(r['ok'] for r in results.values()) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
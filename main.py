@@ -6,21 +6,33 @@ import json
 import os
 import signal
 import re  # [추가] 프로필 ID 추출을 위한 정규표현식
+import csv
+import codecs
+import itertools
+import ctypes
+import math
 from pathlib import Path
+from collections import deque
 import threading
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QGridLayout, 
                              QPushButton, QVBoxLayout, QHBoxLayout, QLabel, 
                              QLineEdit, QMessageBox, QFrame, QTextEdit, QToolTip,
-                             QMenu, QWidgetAction)
+                             QMenu, QWidgetAction, QFileDialog, QComboBox, QPlainTextEdit,
+                             QInputDialog)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QPoint
-from PyQt6.QtGui import QCursor, QFont, QColor, QAction
+from PyQt6.QtGui import QCursor, QFont, QColor, QAction, QImage, QPixmap
 
 import win32gui
 import win32con
 import win32process
 import win32api
 import win32clipboard
+import win32ui
+
+from fleet import FleetAgent, FleetError, DEFAULT_PORT as FLEET_DEFAULT_PORT
+from devtools import TabManager, TabIndex, DevToolsError, page_targets, new_context, url_matcher
+from thumbcache import ThumbnailCache, ThumbnailScheduler
 
 # ==========================================
 # 테마 및 레이아웃 설정 상수
@@ -59,25 +71,209 @@ EDGE_PATH = r"C:\Program Files (x86)\Microsoft\Edge\Application\msedge.exe"
 APPDATA_DIR = Path(os.getenv('LOCALAPPDATA')) / 'EdgeMultiLauncher'
 CONFIG_FILE = APPDATA_DIR / 'window_config.json'
 
-class AppDataConfig:
+SETTINGS_VERSION = 2
+DEFAULT_SETTINGS = {
+    'window': {},                                   # 런처 창 위치/크기
+    'layouts': {},                                  # 이름 → {'monitor': 'primary'|'secondary', 'cols', 'rows'}
+    'hotkeys': {'click_capture': 'F2'},
+    'groups': {},                                   # 이름 → {'profiles', 'layout', 'flags', 'targets'}
+    'timing': {'url_distribute': {'max_retries': 2, 'load_timeout': 20.0, 'min_dwell': 1.5}},
+    'fleet': {'host': '127.0.0.1', 'port': 47800, 'token': None},   # 원격 제어 에이전트 (외부 공개 시 host/token 설정)
+    'devtools': {'enabled': False, 'port': 9300},                   # 탭 일괄 작업용 원격 디버깅 포트 (모든 프로필이 브라우저 하나를 공유)
+    'supervisor': {'close_hung_windows': False},    # 자동복구가 켜져 있을 때 응답없는 창을 닫고 재실행할지 (기본은 알림만)
+}
+
+def coerce_setting(value, default, path, problems):
+    """기본값과 같은 형태로 맞춤. 숫자는 "9300" 같은 문자열도 받되 변환이 안 되면 기본값을 쓰고 경로를 problems 에 남김"""
+    if isinstance(default, dict):
+        if not isinstance(value, dict):
+            problems.append(path)
+            return json.loads(json.dumps(default))
+        out = dict(value)
+        for key, sub in default.items():
+            out[key] = coerce_setting(value[key], sub, f"{path}.{key}", problems) if key in value else json.loads(json.dumps(sub))
+        return out
+    if isinstance(default, bool):
+        if isinstance(value, bool): return value
+    elif isinstance(default, (int, float)):
+        if not isinstance(value, bool):
+            try: return type(default)(value)
+            except (TypeError, ValueError): pass
+    elif isinstance(default, str):
+        if isinstance(value, str): return value
+    elif default is None:
+        if value is None or isinstance(value, str): return value
+    problems.append(path)
+    return default
+
+def normalize_flags(value):
+    """실행 플래그를 문자열 목록으로 ('--a --b' 처럼 한 문자열이면 공백으로 나눔)"""
+    if isinstance(value, str): return value.split()
+    if isinstance(value, list): return [v for v in value if isinstance(v, str) and v]
+    return []
+
+def normalize_ids(value):
+    if not isinstance(value, list): return []
+    return sorted({v for v in value if isinstance(v, int) and not isinstance(v, bool) and 1 <= v <= 100})
+
+def normalize_group(group):
+    """그룹 설정을 {'profiles', 'targets'(선택), 'layout', 'flags'} 형태로 맞춤. 그룹으로 쓸 수 없으면 None"""
+    if not isinstance(group, dict): return None
+    out = {'profiles': normalize_ids(group.get('profiles')), 'flags': normalize_flags(group.get('flags')),
+           'layout': group.get('layout') if isinstance(group.get('layout'), (str, dict)) else None}
+    if group.get('targets'): out['targets'] = normalize_ids(group['targets'])
+    return out
+
+class SettingsStore:
+    """설정 저장소. 메모리 상태를 바로 갱신하고 디스크 기록은 백그라운드 쓰레드가 맡는다.
+    마지막 변경 후 delay 초 동안 추가 변경이 없을 때 한 번만 기록하며(드래그 중 연속 이동 병합),
+    임시 파일에 쓴 뒤 os.replace 로 교체해 중간에 꺼져도 파일이 깨지지 않는다."""
+    def __init__(self, path, delay=0.5, on_error=None):
+        self.path = Path(path)
+        self.delay = delay
+        self.on_error = on_error
+        self.last_error = None
+        self.cond = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.dirty = False
+        self.deadline = 0.0
+        self.running = True
+        self.data = self._load()
+        self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self.thread.start()
+
+    def _report(self, msg):
+        self.last_error = msg
+        if self.on_error:
+            try: self.on_error(msg)
+            except Exception: pass
+
     @staticmethod
-    def save_window_position(x, y, width, height):
-        try:
-            APPDATA_DIR.mkdir(parents=True, exist_ok=True)
-            config = {'window_x': int(x), 'window_y': int(y), 'window_width': int(width), 'window_height': int(height)}
-            with open(CONFIG_FILE, 'w', encoding='utf-8') as f: 
-                json.dump(config, f, indent=2)
-        except: pass
-    
+    def _migrate(raw):
+        if 'version' not in raw:
+            # v1: {'window_x', 'window_y', 'window_width', 'window_height'} 평면 구조
+            window = {}
+            if all(k in raw for k in ('window_x', 'window_y', 'window_width', 'window_height')):
+                window = {'x': raw['window_x'], 'y': raw['window_y'], 'width': raw['window_width'], 'height': raw['window_height']}
+            raw = {'version': 2, 'window': window}
+        data = json.loads(json.dumps(DEFAULT_SETTINGS))
+        for key, value in raw.items():
+            if key in data and isinstance(data[key], dict) and isinstance(value, dict): data[key].update(value)
+            else: data[key] = value
+        data['version'] = SETTINGS_VERSION
+        return data
+
     @staticmethod
-    def load_window_position():
+    def _sanitize(data):
+        """섹션 안의 값까지 기본값 형태로 맞춘다 (잘못된 값 때문에 Qt 슬롯에서 예외가 나지 않도록). 고친 경로 목록 반환"""
+        problems = []
+        devtools = data.get('devtools')
+        if isinstance(devtools, dict) and 'base_port' in devtools and 'port' not in devtools:
+            devtools['port'] = devtools.pop('base_port')   # 예전 이름
+        for section in ('hotkeys', 'timing', 'fleet', 'devtools', 'supervisor'):
+            data[section] = coerce_setting(data.get(section), DEFAULT_SETTINGS[section], section, problems)
+        groups = {}
+        for name, group in (data.get('groups') or {}).items():
+            fixed = normalize_group(group)
+            if fixed is None: problems.append(f"groups.{name}"); continue
+            if any(k in group and group[k] != fixed.get(k) for k in ('profiles', 'targets', 'flags', 'layout')):
+                problems.append(f"groups.{name}")
+            groups[name] = fixed
+        data['groups'] = groups
+        window = data.get('window') or {}
+        if window and not all(isinstance(window.get(k), int) and not isinstance(window.get(k), bool)
+                              for k in ('x', 'y', 'width', 'height')):
+            problems.append('window')
+            data['window'] = {}
+        return problems
+
+    def _load(self):
         try:
-            if CONFIG_FILE.exists():
-                with open(CONFIG_FILE, 'r', encoding='utf-8') as f: 
-                    config = json.load(f)
-                return (config['window_x'], config['window_y'], config['window_width'], config['window_height'])
-        except: pass
-        return None
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    raw = json.load(f)
+                if not isinstance(raw, dict): raise ValueError("설정 파일 최상위가 객체가 아님")
+                version = raw.get('version', 1)
+                if isinstance(version, bool) or not isinstance(version, int): raise ValueError(f"설정 버전 형식 오류: {version!r}")
+                if version > SETTINGS_VERSION: raise ValueError(f"더 새로운 설정 버전: {version}")
+                bad = [k for k, v in DEFAULT_SETTINGS.items() if isinstance(v, dict) and k in raw and not isinstance(raw[k], dict)]
+                if bad: raise ValueError(f"섹션 형식 오류: {', '.join(bad)}")
+                data = self._migrate(raw)
+                problems = self._sanitize(data)
+                if problems: self._report(f"설정 값 형식 오류 ({', '.join(problems)}) - 해당 항목은 기본값 사용")
+                return data
+        except OSError as e:
+            self._report(f"설정 불러오기 실패 ({e}) - 기본값 사용")
+        except ValueError as e:
+            # 다음 저장 때 기본값으로 덮어쓰지 않도록 원본을 옆으로 옮겨 둔다
+            backup = self.path.with_name(self.path.name + '.broken')
+            try: os.replace(self.path, backup); kept = f", 원본은 {backup.name} 로 보관"
+            except OSError: kept = ""
+            self._report(f"설정 불러오기 실패 ({e}) - 기본값 사용{kept}")
+        return self._migrate({'version': SETTINGS_VERSION})
+
+    def get(self, section, default=None):
+        with self.cond:
+            value = self.data.get(section, default)
+            return json.loads(json.dumps(value)) if isinstance(value, (dict, list)) else value
+
+    def set(self, section, value):
+        with self.cond:
+            if self.data.get(section) == value: return
+            self.data[section] = json.loads(json.dumps(value))
+            self.dirty = True
+            self.deadline = time.monotonic() + self.delay
+            self.cond.notify()
+
+    def update(self, section, **values):
+        current = self.get(section, {}) or {}
+        current.update(values)
+        self.set(section, current)
+
+    def _take_snapshot(self):
+        self.dirty = False
+        return json.dumps(self.data, indent=2, ensure_ascii=False)
+
+    def _write(self, payload):
+        with self.write_lock:
+            tmp = self.path.with_name(self.path.name + '.tmp')
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+                return True
+            except OSError as e:
+                self._report(f"설정 저장 실패: {e}")
+                with self.cond:
+                    # 다음 변경 또는 재시도 시 다시 기록
+                    self.dirty = True
+                    self.deadline = time.monotonic() + max(self.delay, 2.0)
+                return False
+
+    def _writer_loop(self):
+        while True:
+            with self.cond:
+                while self.running and (not self.dirty or time.monotonic() < self.deadline):
+                    self.cond.wait(max(self.deadline - time.monotonic(), 0.01) if self.dirty else None)
+                if not self.running: return
+                payload = self._take_snapshot()
+            self._write(payload)
+
+    def flush(self):
+        with self.cond:
+            if not self.dirty: return True
+            payload = self._take_snapshot()
+        return self._write(payload)
+
+    def close(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.thread.join(timeout=1.0)
+        self.flush()
 
 class WindowUtils:
     @staticmethod
@@ -158,6 +354,15 @@ class WindowUtils:
             return True
         except: return False
 
+    @staticmethod
+    def move_window(hwnd, x, y, w, h):
+        """포커스를 옮기지 않고 위치/크기만 변경 (일괄 배치용)"""
+        try:
+            if win32gui.IsIconic(hwnd) or win32gui.IsZoomed(hwnd): win32gui.ShowWindow(hwnd, win32con.SW_SHOWNOACTIVATE)
+            win32gui.SetWindowPos(hwnd, win32con.HWND_TOP, int(x), int(y), int(w), int(h), win32con.SWP_NOACTIVATE)
+            return True
+        except: return False
+
     @staticmethod
     def get_all_edge_hwnds():
         hwnds = set()
@@ -205,12 +410,52 @@ class WindowUtils:
             return True
         except: return False
 
+    @staticmethod
+    def set_clipboard_text(text, retries=3):
+        for _ in range(retries):
+            try:
+                win32clipboard.OpenClipboard()
+                try:
+                    win32clipboard.EmptyClipboard()
+                    win32clipboard.SetClipboardText(text)
+                finally:
+                    win32clipboard.CloseClipboard()
+                return True
+            except: time.sleep(0.1)
+        return False
+
+    @staticmethod
+    def press_key(vk_key, modifier=None):
+        if modifier: win32api.keybd_event(modifier, 0, 0, 0)
+        win32api.keybd_event(vk_key, 0, 0, 0)
+        time.sleep(0.05)
+        win32api.keybd_event(vk_key, 0, win32con.KEYEVENTF_KEYUP, 0)
+        if modifier: win32api.keybd_event(modifier, 0, win32con.KEYEVENTF_KEYUP, 0)
+
+    @staticmethod
+    def paste_url(new_tab=False):
+        """포커스된 창의 주소창에 클립보드 URL 붙여넣기 후 이동 (Ctrl+T → Ctrl+L → Ctrl+V → Enter)"""
+        if new_tab:
+            WindowUtils.press_key(0x54, win32con.VK_CONTROL)
+            time.sleep(0.3)
+        WindowUtils.press_key(0x4C, win32con.VK_CONTROL)
+        time.sleep(0.2)
+        WindowUtils.press_key(0x56, win32con.VK_CONTROL)
+        time.sleep(0.15)
+        WindowUtils.press_key(win32con.VK_RETURN)
+
+    @staticmethod
+    def get_window_title(hwnd):
+        try: return win32gui.GetWindowText(hwnd)
+        except: return ""
+
 # ==========================================
 # 전역 핫키 모니터링
 # ==========================================
 class GlobalHotkeyMonitor:
-    def __init__(self, callback):
+    def __init__(self, callback, vk_key=win32con.VK_F2):
         self.callback = callback
+        self.vk_key = vk_key
         self.running = False
         self.thread = None
         self.last_f2_state = False
@@ -227,7 +472,7 @@ class GlobalHotkeyMonitor:
     def _monitor_loop(self):
         while self.running:
             try:
-                current_state = win32api.GetAsyncKeyState(win32con.VK_F2) & 0x8000
+                current_state = win32api.GetAsyncKeyState(self.vk_key) & 0x8000
                 if current_state and not self.last_f2_state:
                     self.callback()
                 self.last_f2_state = current_state
@@ -240,12 +485,65 @@ class GlobalHotkeyMonitor:
 class LauncherThread(QThread):
     log_signal = pyqtSignal(str)
     profile_launched_signal = pyqtSignal(int, int) 
+    context_signal = pyqtSignal(int, str)   # 프로필 번호, DevTools browserContextId
     finished_signal = pyqtSignal()
 
-    def __init__(self, selected_ids, existing_profile_windows):
+    def __init__(self, selected_ids, existing_profile_windows, devtools_port=None, layout=None, extra_flags=None, batch=False):
         super().__init__()
         self.selected_ids = sorted(selected_ids)
         self.existing_profile_windows = existing_profile_windows.copy() # 원본 보호를 위해 카피
+        self.devtools_port = devtools_port
+        self.layout = layout
+        self.extra_flags = normalize_flags(extra_flags)
+        self.batch = batch
+
+    def build_args(self, p_id):
+        args = [EDGE_PATH, f"--profile-directory=Profile {p_id}", "--new-window", "--no-first-run", "--no-default-browser-check"]
+        # 프로필들은 브라우저 프로세스 하나를 공유하므로 포트는 처음 브라우저를 띄운 실행에만 적용된다
+        if self.devtools_port: args.append(f"--remote-debugging-port={self.devtools_port}")
+        return args + self.extra_flags
+
+    def snapshot_targets(self):
+        """디버깅 포트의 탭 목록. 포트가 응답하지 않으면 None"""
+        if not self.devtools_port: return []
+        try: return page_targets(f"127.0.0.1:{self.devtools_port}", timeout=1.0)
+        except (OSError, ValueError, DevToolsError): return None
+
+    def match_context(self, p_id, pre_targets):
+        """실행 직후 새로 생긴 탭의 browserContextId 를 이 프로필의 컨텍스트로 기록 (탭 일괄 작업 범위 지정용)"""
+        if not self.devtools_port: return
+        deadline = time.time() + 2.0
+        while time.time() < deadline:
+            targets = self.snapshot_targets()
+            context = new_context(pre_targets or [], targets) if targets is not None else None
+            if context:
+                self.context_signal.emit(p_id, context)
+                return
+            time.sleep(0.1)
+        if targets is None:
+            # 포트가 아예 열리지 않으면 남은 프로필마다 2초씩 기다리지 않도록 이번 실행에서는 매칭을 끈다
+            self.devtools_port = None
+            self.log_signal.emit("⚠️ 원격 디버깅 포트가 응답하지 않아 탭 작업을 쓸 수 없습니다. Edge 가 이미 포트 없이 실행 중이었거나, "
+                                 "최신 Edge 가 기본 사용자 데이터 폴더에서는 --remote-debugging-port 를 무시하는 경우입니다 "
+                                 "(Edge 를 모두 닫고 다시 실행해도 같으면 이 환경에서는 지원되지 않음)")
+            return
+        self.log_signal.emit(f"⚠️ Profile {p_id} 디버깅 컨텍스트를 찾지 못해 탭 작업에서 제외됩니다")
+
+    def get_layout_pos(self, i, m1, m2):
+        """그룹 배치 설정이 있으면 그룹 내 순번대로 cols x rows 칸에 배치 (칸이 모자라면 순환), 없으면 기본 배치"""
+        if not self.layout: return self.get_target_pos(i, m1, m2)
+        mon = m2 if self.layout.get('monitor') == 'secondary' else m1
+        ids = sorted(self.layout.get('ids') or self.selected_ids)
+        cols = int(self.layout.get('cols') or math.ceil(math.sqrt(len(ids))))
+        rows = int(self.layout.get('rows') or math.ceil(len(ids) / cols))
+        idx = (ids.index(i) if i in ids else len(ids)) % (cols * rows)
+        w, h = mon['width'] / cols, mon['height'] / rows
+        return mon['x'] + (idx % cols) * w, mon['y'] + (idx // cols) * h, w, h
+
+    def place(self, hwnd, i, m1, m2):
+        tx, ty, tw, th = self.get_layout_pos(i, m1, m2)
+        if self.batch: WindowUtils.move_window(hwnd, tx, ty, tw, th)
+        else: WindowUtils.activate_and_move(hwnd, tx, ty, tw, th)
 
     def get_target_pos(self, i, m1, m2):
         rem = i % 10
@@ -275,8 +573,7 @@ class LauncherThread(QThread):
         # 1. 기존 실행 중인 창 우선 재배치
         for i in self.selected_ids:
             if i in self.existing_profile_windows and WindowUtils.is_window_valid(self.existing_profile_windows[i]):
-                tx, ty, tw, th = self.get_target_pos(i, m1, m2)
-                WindowUtils.activate_and_move(self.existing_profile_windows[i], tx, ty, tw, th)
+                self.place(self.existing_profile_windows[i], i, m1, m2)
                 self.profile_launched_signal.emit(i, self.existing_profile_windows[i])
             else:
                 ids_to_launch.append(i)
@@ -287,18 +584,22 @@ class LauncherThread(QThread):
 
         # 2. 미실행 프로필 순차 실행 및 매칭
         self.log_signal.emit(f"🚀 {len(ids_to_launch)}개 프로필 정밀 매칭 시작...")
+        # 일괄 모드: 창을 찾는 즉시 다음 프로필을 실행하고, 배치는 끝에서 포커스 없이 한 번에
+        poll_interval = 0.1 if self.batch else 0.5
+        found_windows = []
         
         for p_id in ids_to_launch:
             pre_hwnds = WindowUtils.get_all_edge_hwnds()
+            pre_targets = self.snapshot_targets()
             self.log_signal.emit(f"⏳ Profile {p_id} 실행 시도 중...")
             
-            subprocess.Popen([EDGE_PATH, f"--profile-directory=Profile {p_id}", "--new-window", "--no-first-run", "--no-default-browser-check"])
+            subprocess.Popen(self.build_args(p_id))
             
             found_hwnd = None
             start_wait = time.time()
             # 최대 12초 동안 새로 생성된 해당 프로필의 창을 찾음
             while time.time() - start_wait < 12:
-                time.sleep(0.5)
+                time.sleep(poll_interval)
                 current_hwnds = WindowUtils.get_all_edge_hwnds()
                 new_hwnds = current_hwnds - pre_hwnds
                 
@@ -312,15 +613,22 @@ class LauncherThread(QThread):
                                 break
                     if found_hwnd: break
             
-            if found_hwnd:
-                tx, ty, tw, th = self.get_target_pos(p_id, m1, m2)
-                WindowUtils.activate_and_move(found_hwnd, tx, ty, tw, th)
+            if found_hwnd: self.match_context(p_id, pre_targets)
+            if found_hwnd and self.batch:
+                found_windows.append((p_id, found_hwnd))
+                self.profile_launched_signal.emit(p_id, found_hwnd)
+                self.log_signal.emit(f"✅ Profile {p_id} 매칭 완료")
+            elif found_hwnd:
+                self.place(found_hwnd, p_id, m1, m2)
                 self.profile_launched_signal.emit(p_id, found_hwnd)
                 self.log_signal.emit(f"✅ Profile {p_id} 매칭 완료")
                 time.sleep(0.4) # 안정성을 위한 짧은 지연
             else:
                 self.log_signal.emit(f"❌ Profile {p_id} 매칭 실패 (타임아웃)")
 
+        for p_id, hwnd in found_windows:
+            self.place(hwnd, p_id, m1, m2)
+
         self.log_signal.emit("✅ 모든 프로세스 완료")
         WindowUtils.ensure_modifiers_released()
         self.finished_signal.emit()
@@ -353,27 +661,14 @@ class SyncThread(QThread):
         if not WindowUtils.wait_for_focus(hwnd, timeout=2.0):
             return False
         try:
-            for _ in range(3):
-                try:
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardText(text)
-                    win32clipboard.CloseClipboard()
-                    break
-                except: time.sleep(0.1)
-            
+            WindowUtils.set_clipboard_text(text)
+
             time.sleep(0.15)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-            win32api.keybd_event(0x56, 0, 0, 0)
-            time.sleep(0.05)
-            win32api.keybd_event(0x56, 0, win32con.KEYEVENTF_KEYUP, 0)
-            win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-            
+            WindowUtils.press_key(0x56, win32con.VK_CONTROL)
+
             if send_enter:
                 time.sleep(0.15)
-                win32api.keybd_event(win32con.VK_RETURN, 0, 0, 0)
-                time.sleep(0.05)
-                win32api.keybd_event(win32con.VK_RETURN, 0, win32con.KEYEVENTF_KEYUP, 0)
+                WindowUtils.press_key(win32con.VK_RETURN)
             return True
         except: return False
 
@@ -386,28 +681,14 @@ class SyncThread(QThread):
 
         if self.action_type == 'url':
             url = self.kwargs.get('url', '').strip()
-            for _ in range(3):
-                try:
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardText(url)
-                    win32clipboard.CloseClipboard()
-                    break
-                except: time.sleep(0.1)
+            WindowUtils.set_clipboard_text(url)
 
         elif self.action_type == 'text':
             text = self.kwargs.get('text', '').strip()
             if not text:
                 self.finished_signal.emit()
                 return
-            for _ in range(3):
-                try:
-                    win32clipboard.OpenClipboard()
-                    win32clipboard.EmptyClipboard()
-                    win32clipboard.SetClipboardText(text)
-                    win32clipboard.CloseClipboard()
-                    break
-                except: time.sleep(0.1)
+            WindowUtils.set_clipboard_text(text)
 
         for idx, (pid, hwnd) in enumerate(active_pids_hwnds, 1):
             if not WindowUtils.bring_to_front(hwnd, focus=True): 
@@ -420,31 +701,7 @@ class SyncThread(QThread):
             
             if self.action_type == 'url':
                 try:
-                    if self.kwargs.get('new_tab', False):
-                        win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-                        win32api.keybd_event(0x54, 0, 0, 0)
-                        time.sleep(0.05)
-                        win32api.keybd_event(0x54, 0, win32con.KEYEVENTF_KEYUP, 0)
-                        win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-                        time.sleep(0.3)
-                    
-                    win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-                    win32api.keybd_event(0x4C, 0, 0, 0)
-                    time.sleep(0.05)
-                    win32api.keybd_event(0x4C, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    time.sleep(0.2)
-                    
-                    win32api.keybd_event(win32con.VK_CONTROL, 0, 0, 0)
-                    win32api.keybd_event(0x56, 0, 0, 0)
-                    time.sleep(0.05)
-                    win32api.keybd_event(0x56, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    win32api.keybd_event(win32con.VK_CONTROL, 0, win32con.KEYEVENTF_KEYUP, 0)
-                    time.sleep(0.15)
-                    
-                    win32api.keybd_event(win32con.VK_RETURN, 0, 0, 0)
-                    time.sleep(0.05)
-                    win32api.keybd_event(win32con.VK_RETURN, 0, win32con.KEYEVENTF_KEYUP, 0)
+                    WindowUtils.paste_url(self.kwargs.get('new_tab', False))
                     self.log_signal.emit(f"📍 URL 전송 ({idx}/{len(active_pids_hwnds)})")
                 except: pass
                 
@@ -490,6 +747,1027 @@ class SyncThread(QThread):
         WindowUtils.ensure_modifiers_released()
         self.finished_signal.emit()
 
+# ==========================================
+# URL 분배 (라운드로빈 작업 큐)
+# ==========================================
+def iter_url_source(text=None, path=None):
+    """붙여넣은 텍스트 또는 파일에서 URL을 한 줄씩 스트리밍 (파일 전체를 메모리에 올리지 않음)"""
+    if path:
+        with open(path, 'r', encoding='utf-8-sig', errors='replace') as f:
+            for line in f:
+                url = line.strip()
+                if url and not url.startswith('#'): yield url
+    else:
+        for line in (text or '').splitlines():
+            url = line.strip()
+            if url and not url.startswith('#'): yield url
+
+class UrlDistributorThread(QThread):
+    """URL 목록을 먼저 비는 프로필부터 하나씩 배정.
+    입력(포커스/키보드)은 이 쓰레드에서 직렬로 처리하고, 페이지 로딩은 창마다 병렬로 진행된다.
+    로딩 완료는 창 제목 변경으로 판단한다. 같은 사이트처럼 제목이 그대로인 페이지는 완료를 알 수 없으므로
+    load_timeout 뒤 '확인 불가'로 세고 다시 보내지 않는다. 전송 실패/창 사라짐만 재시도 큐로 되돌린다."""
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal()
+
+    def __init__(self, url_source, profile_windows, max_retries=2, load_timeout=20.0, min_dwell=1.5):
+        super().__init__()
+        self.url_source = url_source
+        self.profile_windows = profile_windows.copy()
+        self.max_retries = max_retries
+        self.load_timeout = load_timeout
+        self.min_dwell = min_dwell
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def dispatch(self, hwnd, url):
+        if not WindowUtils.bring_to_front(hwnd, focus=True): return False
+        if not WindowUtils.set_clipboard_text(url): return False
+        time.sleep(0.2)
+        try:
+            WindowUtils.paste_url()
+            return True
+        except: return False
+
+    def format_progress(self, slots, completed, unknown, failed, started):
+        elapsed_min = max(time.time() - started, 1e-6) / 60
+        per_profile = " ".join(f"P{pid}:{s['done']}" for pid, s in sorted(slots.items()))
+        return (f"📊 {(completed + unknown) / elapsed_min:.1f} URL/분 | 완료 {completed} 확인 불가 {unknown} 실패 {failed}"
+                f" | {per_profile}")
+
+    def run(self):
+        slots = {pid: {'hwnd': hwnd, 'job': None, 'sent_at': 0.0, 'title': '', 'done': 0, 'failed': 0}
+                 for pid, hwnd in sorted(self.profile_windows.items()) if WindowUtils.is_window_valid(hwnd)}
+        if not slots:
+            self.log_signal.emit("⚠️ 분배할 실행 중인 프로필 없음")
+            self.finished_signal.emit()
+            return
+
+        source = iter(self.url_source)
+        retry_queue = deque()   # (url, attempt)
+        exhausted = aborted = False
+        completed = unknown = failed = 0
+        started = last_report = time.time()
+        self.log_signal.emit(f"🚚 URL 분배 시작 ({len(slots)}개 프로필)")
+
+        while self.running:
+            now = time.time()
+
+            # 1. 작업 중인 프로필의 완료/실패 판정
+            for pid, s in list(slots.items()):
+                job = s['job']
+                if not job: continue
+                url, attempt = job
+                if not WindowUtils.is_window_valid(s['hwnd']):
+                    del slots[pid]
+                    retry_queue.appendleft((url, attempt))
+                    self.log_signal.emit(f"⚠️ Profile {pid} 창 사라짐 - 작업 재배정")
+                    continue
+                elapsed = now - s['sent_at']
+                title = WindowUtils.get_window_title(s['hwnd'])
+                if elapsed >= self.min_dwell and title and title != s['title']:
+                    s['job'] = None; s['done'] += 1; completed += 1
+                elif elapsed >= self.load_timeout:
+                    # 이미 로딩됐을 수 있으므로 다시 보내지 않는다 (중복 방문 방지)
+                    s['job'] = None; s['done'] += 1; unknown += 1
+
+            if not slots:
+                self.log_signal.emit("❌ 남은 프로필 없음 - 분배 중단")
+                aborted = True
+                break
+
+            # 2. 비어있는 프로필에 다음 URL 배정 (재시도 우선)
+            for pid, s in slots.items():
+                if s['job'] or not self.running: continue
+                if retry_queue: job = retry_queue.popleft()
+                elif not exhausted:
+                    try: job = (next(source), 0)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                else: break
+
+                s['title'] = WindowUtils.get_window_title(s['hwnd'])
+                if self.dispatch(s['hwnd'], job[0]):
+                    s['job'] = job; s['sent_at'] = time.time()
+                else:
+                    s['failed'] += 1
+                    if job[1] < self.max_retries: retry_queue.append((job[0], job[1] + 1))
+                    else:
+                        failed += 1
+                        self.log_signal.emit(f"❌ 전송 실패 (재시도 초과): {job[0]}")
+
+            busy = any(s['job'] for s in slots.values())
+            if exhausted and not retry_queue and not busy: break
+
+            if now - last_report >= 2.0:
+                self.log_signal.emit(self.format_progress(slots, completed, unknown, failed, started))
+                last_report = now
+            time.sleep(0.1)
+
+        WindowUtils.ensure_modifiers_released()
+        progress = self.format_progress(slots, completed, unknown, failed, started)
+        if aborted or not self.running:
+            # 보내지 못한 URL 수 (진행 중이던 작업 + 재시도 대기 + 아직 읽지 않은 목록)
+            left = len(retry_queue) + sum(1 for s in slots.values() if s['job'])
+            if not exhausted:
+                try: left += sum(1 for _ in source)
+                except OSError: pass
+            self.log_signal.emit(f"🛑 URL 분배 중단 (미처리 {left}건) " + progress)
+        else:
+            self.log_signal.emit("✅ URL 분배 완료 " + progress)
+        self.finished_signal.emit()
+
+# ==========================================
+# 프로필별 템플릿 텍스트 전송 (CSV/JSONL 스트리밍)
+# ==========================================
+class TemplateRow(dict):
+    """str.format_map 용 매핑. 없는 컬럼은 KeyError 대신 누락 목록에 기록"""
+    def __init__(self, row, profile_id):
+        super().__init__({k.strip(): ('' if v is None else v) for k, v in row.items() if k})
+        self['profile_id'] = profile_id
+        self.missing = []
+
+    def __missing__(self, key):
+        self.missing.append(key)
+        return ''
+
+def parse_profile_id(value):
+    """7, '7', 'Profile 7' 만 허용 (true, 'Profile 2x3' 같은 값은 None)"""
+    if isinstance(value, bool): return None
+    if isinstance(value, int): return value
+    if not isinstance(value, str): return None
+    match = re.fullmatch(r"(?:profile\s*)?(\d+)", value.strip(), re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+def detect_encoding(path):
+    """UTF-8 로 끝까지 디코딩되면 utf-8-sig, 아니면 엑셀 한국어 기본값인 cp949 (파일을 청크 단위로만 읽음)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 16), b''): decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        return 'cp949'
+
+def iter_data_rows(path):
+    """CSV/JSONL 파일을 한 행씩 스트리밍 → (행 번호, dict 또는 None, 오류 메시지)"""
+    is_jsonl = Path(path).suffix.lower() in ('.jsonl', '.ndjson')
+    # cp949 로도 깨진 바이트는 대체 문자로 읽어 해당 행만 템플릿 결과에서 드러나게 함
+    with open(path, 'r', encoding=detect_encoding(path), errors='replace', newline='') as f:
+        if is_jsonl:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line: continue
+                try: row = json.loads(line)
+                except ValueError as e:
+                    yield line_no, None, f"JSON 파싱 오류 ({e.msg})"
+                    continue
+                if isinstance(row, dict): yield line_no, row, None
+                else: yield line_no, None, "JSON 객체가 아님"
+        else:
+            reader = csv.DictReader(f)
+            while True:
+                last_line = reader.line_num
+                try: row = next(reader)
+                except StopIteration: break
+                except csv.Error as e:
+                    # 오류가 난 줄은 line_num 에 반영되지 않을 수 있음
+                    yield max(reader.line_num, last_line + 1), None, f"CSV 형식 오류 ({e})"
+                    continue
+                yield reader.line_num, row, None
+
+class TemplateBroadcastThread(QThread):
+    """데이터 파일의 각 행을 템플릿으로 렌더링해 profile_id 컬럼이 가리키는 프로필에 전송.
+    1단계에서 파일을 스트리밍하며 렌더링 결과만 대상별 큐에 쌓고,
+    2단계에서 대상마다 한 번만 포커스를 잡고 큐를 연속으로 붙여넣는다."""
+    log_signal = pyqtSignal(str)
+    errors_signal = pyqtSignal(list)
+    finished_signal = pyqtSignal()
+
+    def __init__(self, template, data_path, profile_windows, send_enter=False, key_column='profile_id'):
+        super().__init__()
+        self.template = template
+        self.data_path = data_path
+        self.profile_windows = profile_windows.copy()
+        self.send_enter = send_enter
+        self.key_column = key_column
+
+    def build_queues(self, targets, errors):
+        queues = {}
+        rows = 0
+        for line_no, row, err in iter_data_rows(self.data_path):
+            rows += 1
+            if err:
+                errors.append(f"{line_no}행: {err}")
+                continue
+            # TemplateRow 와 같이 앞뒤 공백을 뺀 컬럼 이름으로 찾는다 (CSV 헤더 "profile_id, keyword" 등)
+            raw_id = next((v for k, v in row.items() if isinstance(k, str) and k.strip() == self.key_column), None)
+            pid = parse_profile_id(raw_id)
+            if pid is None:
+                errors.append(f"{line_no}행: '{self.key_column}' 값 없음/형식 오류 ({raw_id!r})")
+                continue
+            if pid not in targets:
+                errors.append(f"{line_no}행: Profile {pid} 창 없음 (미실행 또는 종료됨)")
+                continue
+            mapping = TemplateRow(row, pid)
+            try: text = self.template.format_map(mapping)
+            except (ValueError, IndexError, AttributeError, TypeError) as e:
+                errors.append(f"{line_no}행: 템플릿 오류 ({type(e).__name__}: {e})")
+                continue
+            if mapping.missing:
+                errors.append(f"{line_no}행: 없는 컬럼 {', '.join(sorted(set(mapping.missing)))}")
+                continue
+            queues.setdefault(pid, deque()).append(text)
+        return queues, rows
+
+    def run(self):
+        targets = {pid: hwnd for pid, hwnd in self.profile_windows.items() if WindowUtils.is_window_valid(hwnd)}
+        errors = []
+        try:
+            queues, rows = self.build_queues(targets, errors)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            self.log_signal.emit(f"❌ 데이터 파일 읽기 실패: {e}")
+            if errors: self.errors_signal.emit(errors)
+            self.finished_signal.emit()
+            return
+
+        queued = sum(len(q) for q in queues.values())
+        self.log_signal.emit(f"🧾 {rows}행 중 {queued}건 렌더링 완료 ({len(queues)}개 대상)")
+
+        sent = 0
+        for idx, (pid, queue) in enumerate(sorted(queues.items()), 1):
+            hwnd = targets[pid]
+            while queue:
+                text = queue[0]
+                if not WindowUtils.is_window_valid(hwnd):
+                    errors.append(f"Profile {pid}: 전송 중 창 사라짐 ({len(queue)}건 미전송)")
+                    break
+                if not WindowUtils.is_window_focused(hwnd):
+                    if not WindowUtils.bring_to_front(hwnd, focus=True) or not WindowUtils.wait_for_focus(hwnd, timeout=2.0):
+                        errors.append(f"Profile {pid}: 포커스 실패 ({len(queue)}건 미전송)")
+                        break
+                    WindowUtils.ensure_modifiers_released()
+                if not WindowUtils.set_clipboard_text(text):
+                    errors.append(f"Profile {pid}: 클립보드 설정 실패 ({text[:20]!r})")
+                    queue.popleft()
+                    continue
+                time.sleep(0.1)
+                WindowUtils.press_key(0x56, win32con.VK_CONTROL)
+                if self.send_enter:
+                    time.sleep(0.15)
+                    WindowUtils.press_key(win32con.VK_RETURN)
+                time.sleep(0.15)
+                queue.popleft()
+                sent += 1
+            self.log_signal.emit(f"📝 템플릿 전송 Profile {pid} ({idx}/{len(queues)})")
+
+        WindowUtils.ensure_modifiers_released()
+        if errors:
+            self.log_signal.emit(f"⚠️ 템플릿 전송 {sent}/{queued}건 완료, 오류 {len(errors)}건")
+            self.errors_signal.emit(errors)
+        else:
+            self.log_signal.emit(f"✅ 템플릿 전송 {sent}건 완료")
+        self.finished_signal.emit()
+
+# ==========================================
+# 매크로 녹화/재생 (F2 클릭 캡처 확장)
+# ==========================================
+MACRO_DIR = APPDATA_DIR / 'macros'
+MACRO_VERSION = 1
+MACRO_WAIT_THRESHOLD = 0.3   # 이보다 긴 입력 간격은 대기 단계로 기록 (초)
+MACRO_KEYS = ([win32con.VK_RETURN, win32con.VK_TAB, win32con.VK_ESCAPE, win32con.VK_BACK, win32con.VK_DELETE,
+               win32con.VK_SPACE, win32con.VK_LEFT, win32con.VK_UP, win32con.VK_RIGHT, win32con.VK_DOWN,
+               win32con.VK_F5, win32con.VK_F12]
+              + list(range(0x30, 0x3A)) + list(range(0x41, 0x5B)))
+MOD_CTRL, MOD_SHIFT, MOD_ALT = 1, 2, 4
+MOD_KEYS = [(MOD_CTRL, win32con.VK_CONTROL), (MOD_SHIFT, win32con.VK_SHIFT), (MOD_ALT, win32con.VK_MENU)]
+
+def save_macro(path, steps, source_size=None):
+    """단계 목록을 압축 JSON으로 저장: ["c",x,y] 클릭(클라이언트 영역 비율), ["k",vk,mods] 키, ["w",ms] 대기, ["u",url,new_tab] URL"""
+    data = {'v': MACRO_VERSION, 'size': source_size, 'steps': steps}
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+def _is_num(value, lo=None, hi=None):
+    if isinstance(value, bool) or not isinstance(value, (int, float)): return False
+    return (lo is None or value >= lo) and (hi is None or value <= hi)
+
+def validate_step(step):
+    """단계 하나의 형태/타입 검사. 문제가 있으면 설명 문자열, 정상이면 None"""
+    if not isinstance(step, list) or not step: return "목록이 아님"
+    kind, args = step[0], step[1:]
+    if kind == 'c':
+        if len(args) == 2 and all(_is_num(a, 0, 1) for a in args): return None
+        return "클릭은 [\"c\", 0~1 x, 0~1 y]"
+    if kind == 'k':
+        if len(args) == 2 and all(isinstance(a, int) and not isinstance(a, bool) for a in args) and 0 < args[0] < 256: return None
+        return "키는 [\"k\", vk, mods]"
+    if kind == 'w':
+        if len(args) == 1 and _is_num(args[0], 0): return None
+        return "대기는 [\"w\", ms]"
+    if kind == 'u':
+        if len(args) == 2 and isinstance(args[0], str) and args[0].strip() and isinstance(args[1], (bool, int)): return None
+        return "URL 은 [\"u\", url, new_tab]"
+    return f"알 수 없는 단계 종류 {kind!r}"
+
+def load_macro(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if not isinstance(data, dict): raise ValueError("매크로 파일 최상위가 객체가 아님")
+    if data.get('v') != MACRO_VERSION:
+        raise ValueError(f"지원하지 않는 매크로 버전: {data.get('v')}")
+    steps = data.get('steps')
+    if not isinstance(steps, list): raise ValueError("steps 가 목록이 아님")
+    for i, step in enumerate(steps, 1):
+        problem = validate_step(step)
+        if problem: raise ValueError(f"{i}번째 단계 형식 오류 ({problem}): {step!r}")
+    return steps
+
+class MacroRecorderThread(QThread):
+    """소스 프로필 창 하나에서 클릭/키 입력/대기를 녹화. 첫 클릭한 관리 창이 소스가 된다 (F2와 동일)."""
+    log_signal = pyqtSignal(str)
+
+    def __init__(self, profile_windows):
+        super().__init__()
+        self.profile_windows = profile_windows
+        self.steps = []
+        self.source_hwnd = None
+        self.source_size = None
+        self.running = True
+        self.keys_paused = False
+        self.last_step_time = None
+        self.lock = threading.Lock()
+
+    def stop(self):
+        self.running = False
+
+    def pause_keys(self):
+        """런처가 직접 보내는 키(URL 단계의 Ctrl+L/V, Enter 등)가 녹화되지 않도록 키 캡처를 멈춤"""
+        self.keys_paused = True
+
+    def resume_keys(self):
+        self.keys_paused = False
+
+    def _append(self, step):
+        with self.lock:
+            now = time.time()
+            if self.last_step_time is not None:
+                gap = now - self.last_step_time
+                if gap >= MACRO_WAIT_THRESHOLD: self.steps.append(['w', int(gap * 1000)])
+            self.last_step_time = now
+            self.steps.append(step)
+
+    def add_url(self, url, new_tab=False):
+        self._append(['u', url, int(bool(new_tab))])
+        self.log_signal.emit(f"⏺ URL 단계 기록 ({len(self.steps)})")
+
+    def _capture_click(self):
+        cursor_pos = win32api.GetCursorPos()
+        root_hwnd = win32gui.GetAncestor(win32gui.WindowFromPoint(cursor_pos), win32con.GA_ROOT)
+        if self.source_hwnd is None:
+            if root_hwnd not in self.profile_windows.values(): return
+            self.source_hwnd = root_hwnd
+            self.log_signal.emit("⏺ 소스 창 지정됨 - 녹화 중 (버튼을 다시 누르면 종료)")
+        if root_hwnd != self.source_hwnd: return
+        _, _, w, h = win32gui.GetClientRect(root_hwnd)
+        if w <= 0 or h <= 0: return
+        cx, cy = win32gui.ScreenToClient(root_hwnd, cursor_pos)
+        self.source_size = [w, h]
+        self._append(['c', round(cx / w, 4), round(cy / h, 4)])
+        self.log_signal.emit(f"⏺ 클릭 기록 ({len(self.steps)})")
+
+    def run(self):
+        self.log_signal.emit("⏺ 녹화 대기 - 소스로 쓸 관리 중인 브라우저를 클릭하세요")
+        mouse_down = False
+        key_down = set()
+        while self.running:
+            try:
+                pressed = bool(win32api.GetAsyncKeyState(win32con.VK_LBUTTON) & 0x8000)
+                if pressed and not mouse_down: self._capture_click()
+                mouse_down = pressed
+
+                if self.keys_paused:
+                    # 멈춘 동안 눌린 키는 '이미 눌림'으로 두어 재개 직후 새 입력으로 기록되지 않게 함
+                    key_down = {vk for vk in MACRO_KEYS if win32api.GetAsyncKeyState(vk) & 0x8000}
+                elif self.source_hwnd and win32gui.GetForegroundWindow() == self.source_hwnd:
+                    mods = sum(bit for bit, vk in MOD_KEYS if win32api.GetAsyncKeyState(vk) & 0x8000)
+                    for vk in MACRO_KEYS:
+                        down = bool(win32api.GetAsyncKeyState(vk) & 0x8000)
+                        if down and vk not in key_down: self._append(['k', vk, mods])
+                        if down: key_down.add(vk)
+                        else: key_down.discard(vk)
+                else:
+                    key_down.clear()
+            except: pass
+            time.sleep(0.01)
+        self.log_signal.emit(f"⏹ 녹화 종료 ({len(self.steps)}단계)")
+
+class MacroReplayThread(QThread):
+    """녹화된 단계를 모든 대상에 재생. 대상마다 독립된 단계 커서/대기 타이머를 두고,
+    포커스가 필요 없는 클릭은 바로, 키/URL 단계는 입력 경로를 순서대로 점유하며 실행한다.
+    한 대상이 대기하는 동안 다른 대상의 단계가 진행된다."""
+    log_signal = pyqtSignal(str)
+    report_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal()
+
+    def __init__(self, steps, profile_windows):
+        super().__init__()
+        self.steps = steps
+        self.profile_windows = profile_windows.copy()
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def execute(self, hwnd, step):
+        kind = step[0]
+        if kind == 'c':
+            _, _, w, h = win32gui.GetClientRect(hwnd)
+            return WindowUtils.click_at_position(hwnd, step[1] * w, step[2] * h)
+        if kind == 'k':
+            # SyncThread 와 같이 포커스가 실제로 넘어온 뒤에만 키를 보낸다 (다른 창에 입력 방지)
+            if not WindowUtils.bring_to_front(hwnd, focus=True) or not WindowUtils.wait_for_focus(hwnd, timeout=2.0): return False
+            held = [vk for bit, vk in MOD_KEYS if step[2] & bit]
+            for vk in held: win32api.keybd_event(vk, 0, 0, 0)
+            WindowUtils.press_key(step[1])
+            for vk in reversed(held): win32api.keybd_event(vk, 0, win32con.KEYEVENTF_KEYUP, 0)
+            return True
+        if kind == 'u':
+            if not WindowUtils.bring_to_front(hwnd, focus=True) or not WindowUtils.wait_for_focus(hwnd, timeout=2.0): return False
+            if not WindowUtils.set_clipboard_text(step[1]): return False
+            time.sleep(0.2)
+            WindowUtils.paste_url(bool(step[2]))
+            return True
+        return False
+
+    def format_report(self, timings, failures, total):
+        lines = [f"총 {total:.1f}초, 실패 {sum(failures)}건"]
+        for i, step in enumerate(self.steps):
+            samples = timings[i]
+            if not samples: continue
+            avg = sum(samples) / len(samples) * 1000
+            label = step[0] if step[0] != 'w' else f"w {step[1]}ms"
+            lines.append(f"#{i + 1} {label}: 평균 {avg:.0f}ms 최대 {max(samples) * 1000:.0f}ms 실패 {failures[i]}")
+        return "\n".join(lines)
+
+    def run(self):
+        pipelines = {pid: {'hwnd': hwnd, 'idx': 0, 'ready_at': 0.0}
+                     for pid, hwnd in sorted(self.profile_windows.items()) if WindowUtils.is_window_valid(hwnd)}
+        if not pipelines or not self.steps:
+            self.finished_signal.emit()
+            return
+
+        timings = [[] for _ in self.steps]
+        failures = [0] * len(self.steps)
+        started = time.time()
+        self.log_signal.emit(f"▶ 매크로 재생 ({len(self.steps)}단계 × {len(pipelines)}개 대상)")
+
+        while self.running:
+            pending = [(p['ready_at'], pid) for pid, p in pipelines.items() if p['idx'] < len(self.steps)]
+            if not pending: break
+            ready_at, pid = min(pending)
+            now = time.time()
+            if ready_at > now:
+                time.sleep(min(ready_at - now, 0.05))
+                continue
+
+            p = pipelines[pid]
+            i = p['idx']
+            step = self.steps[i]
+            p['idx'] += 1
+            if step[0] == 'w':
+                p['ready_at'] = now + step[1] / 1000
+                timings[i].append(step[1] / 1000)
+                continue
+            if not WindowUtils.is_window_valid(p['hwnd']):
+                failures[i] += len(self.steps) - i
+                p['idx'] = len(self.steps)
+                self.log_signal.emit(f"⚠️ Profile {pid} 창 사라짐 - 재생 중단")
+                continue
+            t0 = time.time()
+            try: ok = self.execute(p['hwnd'], step)
+            except: ok = False
+            timings[i].append(time.time() - t0)
+            if not ok: failures[i] += 1
+            p['ready_at'] = time.time() + 0.05
+            self.log_signal.emit(f"▶ Profile {pid} {p['idx']}/{len(self.steps)}")
+
+        WindowUtils.ensure_modifiers_released()
+        report = self.format_report(timings, failures, time.time() - started)
+        self.log_signal.emit(("✅ 매크로 재생 완료 " if self.running else "🛑 매크로 재생 중단 ") + report.splitlines()[0])
+        self.report_signal.emit(report)
+        self.finished_signal.emit()
+
+# ==========================================
+# 프로필 감시 (충돌/응답없음 자동 재실행)
+# ==========================================
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+
+class ProfileSupervisor(QThread):
+    """관리 중인 창을 UI 쓰레드 밖에서 주기적으로 점검.
+    - 런처에서 닫았거나, 창이 사라졌는데 브라우저 프로세스가 살아있거나 종료 코드 0으로 끝남 → 사용자 종료
+      (마지막 창을 X 로 닫으면 프로세스도 곧 정상 종료되므로, 추적 시 열어둔 프로세스 핸들로 종료 코드를 확인)
+    - 브라우저 프로세스가 비정상 종료 코드로 사라짐 → 충돌
+    - WM_NULL 응답 없음이 연속 hang_limit 회 → 응답없음. 기본은 알림만 하고 응답이 돌아오면 다시 정상으로 본다.
+      자동복구와 close_hung 이 모두 켜져 있을 때만 그 창 하나에 WM_CLOSE 를 보내고, 창이 실제로 사라진 뒤에 재실행한다.
+      모든 프로필이 브라우저 프로세스 하나를 공유하므로 프로세스를 강제 종료하지는 않는다.
+    충돌/응답없음은 지수 백오프로 재실행을 요청하며, restart_window 초 안에 restart_budget 회를 넘으면 포기한다.
+    WM_NULL 점검은 잠금 밖에서 하므로 UI 쓰레드의 track/mark_user_close 가 점검 시간만큼 막히지 않는다."""
+    log_signal = pyqtSignal(str)
+    relaunch_signal = pyqtSignal(int)
+    metrics_signal = pyqtSignal(int, str)
+
+    def __init__(self, interval=1.0, base_delay=2.0, max_delay=120.0, restart_budget=5, restart_window=600.0,
+                 hang_limit=3, relaunch_timeout=30.0, close_grace=5.0):
+        super().__init__()
+        self.interval = interval
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.restart_budget = restart_budget
+        self.restart_window = restart_window
+        self.hang_limit = hang_limit
+        self.relaunch_timeout = relaunch_timeout
+        self.close_grace = close_grace
+        self.auto_relaunch = False
+        self.close_hung = False
+        self.running = True
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def stop(self):
+        self.running = False
+
+    def track(self, pid, hwnd):
+        try: _, proc_pid = win32process.GetWindowThreadProcessId(hwnd)
+        except: proc_pid = None
+        with self.lock:
+            entry = self.entries.setdefault(pid, {'restarts': [], 'total_restarts': 0, 'last_reason': None})
+            if entry.get('hwnd') == hwnd and entry.get('state') == 'running': return
+        # 프로세스가 끝난 뒤에도 종료 코드를 읽을 수 있도록 핸들을 잡아둔다 (PyHANDLE 은 교체 시 자동으로 닫힘)
+        try: handle = win32api.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION | win32con.SYNCHRONIZE, False, proc_pid) if proc_pid else None
+        except: handle = None
+        with self.lock:
+            entry.update({'hwnd': hwnd, 'proc_pid': proc_pid, 'proc_handle': handle, 'state': 'running', 'started': time.time(),
+                          'user_close': False, 'hang_count': 0})
+        self._emit_metrics(pid)
+
+    def mark_user_close(self, pid):
+        with self.lock:
+            if pid in self.entries: self.entries[pid]['user_close'] = True
+
+    def metrics(self, pid):
+        with self.lock:
+            entry = self.entries.get(pid)
+            if not entry: return None
+            uptime = time.time() - entry['started'] if entry.get('state') == 'running' else 0.0
+            return {'state': entry.get('state'), 'uptime': uptime, 'restarts': entry['total_restarts'], 'last_reason': entry['last_reason']}
+
+    def _emit_metrics(self, pid):
+        m = self.metrics(pid)
+        if not m: return
+        reason = {'crash': '충돌', 'hang': '응답없음'}.get(m['last_reason'], '-')
+        self.metrics_signal.emit(pid, f"Profile {pid} | 가동 {int(m['uptime'] // 60)}분 | 재시작 {m['restarts']}회 | 최근 원인: {reason}")
+
+    def _probe_hung(self, hwnd):
+        try:
+            win32gui.SendMessageTimeout(hwnd, win32con.WM_NULL, 0, 0, win32con.SMTO_ABORTIFHUNG, 1000)
+            return False
+        except: return True
+
+    def _proc_state(self, entry):
+        """'alive' | 'exited'(종료 코드 0) | 'crashed'. 핸들이 없으면 psutil 로 생존 여부만 본다"""
+        handle = entry.get('proc_handle')
+        if handle is not None:
+            try:
+                code = win32process.GetExitCodeProcess(handle)
+                if code == STILL_ACTIVE: return 'alive'
+                return 'exited' if code == 0 else 'crashed'
+            except: pass
+        if entry['proc_pid'] is not None and psutil.pid_exists(entry['proc_pid']): return 'alive'
+        return 'crashed'
+
+    def _schedule(self, pid, entry, reason, now):
+        entry['last_reason'] = reason
+        entry['restarts'] = [t for t in entry['restarts'] if now - t < self.restart_window]
+        if not self.auto_relaunch:
+            entry['state'] = 'stopped'
+            return f"💥 Profile {pid} {'충돌' if reason == 'crash' else '응답없음'} 감지 (자동복구 꺼짐)"
+        if len(entry['restarts']) >= self.restart_budget:
+            entry['state'] = 'gave_up'
+            return f"🛑 Profile {pid} 재시작 한도 초과 ({self.restart_budget}회/{int(self.restart_window // 60)}분) - 복구 중단"
+        delay = min(self.base_delay * (2 ** len(entry['restarts'])), self.max_delay)
+        entry['state'] = 'waiting'
+        entry['next_retry'] = now + delay
+        return f"💥 Profile {pid} {'충돌' if reason == 'crash' else '응답없음'} - {delay:.0f}초 후 재실행"
+
+    def _check(self, pid, entry, now, hung):
+        """hung 은 잠금 밖에서 잰 WM_NULL 점검 결과 (점검하지 않았으면 None)"""
+        state = entry.get('state')
+        if state in ('running', 'hung'):
+            hwnd = entry['hwnd']
+            if not WindowUtils.is_window_valid(hwnd):
+                if entry['user_close'] or self._proc_state(entry) != 'crashed':
+                    entry['state'] = 'closed'
+                    return None
+                return self._schedule(pid, entry, 'crash', now)
+            if hung is None: return None
+            if not hung:
+                entry['hang_count'] = 0
+                if state == 'hung':
+                    entry['state'] = 'running'
+                    return f"✅ Profile {pid} 응답 회복"
+                return None
+            entry['hang_count'] += 1
+            if state == 'running' and entry['hang_count'] >= self.hang_limit:
+                entry['last_reason'] = 'hang'
+                if not (self.auto_relaunch and self.close_hung):
+                    entry['state'] = 'hung'
+                    return f"⚠️ Profile {pid} 응답없음 감지 (창 닫기/재실행 안 함)"
+                try: win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+                except: pass
+                entry['state'] = 'closing'
+                entry['close_deadline'] = now + self.close_grace
+                return f"🧊 Profile {pid} 응답없음 - 창 종료 시도"
+        elif state == 'closing':
+            # 응답없는 창은 WM_CLOSE 를 처리하지 못할 수 있으므로 창이 실제로 사라질 때까지 재실행하지 않는다
+            if not WindowUtils.is_window_valid(entry['hwnd']): return self._schedule(pid, entry, 'hang', now)
+            if now < entry['close_deadline']: return None
+            entry['state'] = 'hung'
+            return f"⚠️ Profile {pid} 응답없는 창이 닫히지 않음 - 직접 확인 필요"
+        elif state == 'waiting' and now >= entry['next_retry']:
+            entry['state'] = 'relaunching'
+            entry['relaunch_at'] = now
+            entry['restarts'].append(now)
+            entry['total_restarts'] += 1
+            self.relaunch_signal.emit(pid)
+            return f"🔁 Profile {pid} 재실행 요청 ({entry['total_restarts']}회째)"
+        elif state == 'relaunching' and now - entry['relaunch_at'] > self.relaunch_timeout:
+            return self._schedule(pid, entry, entry['last_reason'] or 'crash', now)
+        return None
+
+    def run(self):
+        last_metrics = 0.0
+        while self.running:
+            now = time.time()
+            with self.lock:
+                items = list(self.entries.items())
+            for pid, entry in items:
+                with self.lock:
+                    hwnd = entry.get('hwnd') if entry.get('state') in ('running', 'hung') else None
+                # 응답없는 창은 점검에 최대 1초 걸리므로 잠금을 잡지 않은 채로 잰다
+                hung = self._probe_hung(hwnd) if hwnd and WindowUtils.is_window_valid(hwnd) else None
+                with self.lock:
+                    # 점검 중에 재추적되어 창이 바뀌었으면 결과를 버린다
+                    if entry.get('hwnd') != hwnd: hung = None
+                    msg = self._check(pid, entry, now, hung)
+                if msg:
+                    self.log_signal.emit(msg)
+                    self._emit_metrics(pid)
+            if now - last_metrics >= 30:
+                for pid, _ in items: self._emit_metrics(pid)
+                last_metrics = now
+            time.sleep(self.interval)
+
+# ==========================================
+# 원격 제어 에이전트 백엔드 (fleet.py)
+# ==========================================
+class LauncherAgentBackend:
+    """fleet.FleetAgent 의 명령을 런처 창에 전달. 에이전트 쓰레드에서 호출되므로
+    실제 실행/전송은 시그널로 UI 쓰레드에 넘기고 즉시 접수 결과만 돌려준다."""
+    # 전송 종류 → (필수 문자열 인자, 허용하는 불리언 인자)
+    BROADCAST_ACTIONS = {'url': ('url', ('new_tab',)), 'text': ('text', ('send_enter',)),
+                         'key': ('key_combo', ()), 'f12': (None, ())}
+    KEY_COMBOS = ('ctrl+t', 'ctrl+w', 'f5')
+
+    def __init__(self, window):
+        self.window = window
+
+    def list_profiles(self):
+        return sorted(pid for pid, hwnd in list(self.window.profile_windows.items()) if WindowUtils.is_window_valid(hwnd))
+
+    def launch(self, ids):
+        ids = [pid for pid in ids if 1 <= pid <= 100]
+        self.window.fleet_launch_signal.emit(ids)
+        # 실행은 UI 쓰레드에서 나중에 일어나므로 접수된 ID 는 launched 가 아니라 queued 로 돌려준다
+        return {'launched': [], 'queued': ids, 'failed': []}
+
+    def close(self, ids):
+        running = set(self.list_profiles())
+        closed = [pid for pid in ids if pid in running]
+        self.window.fleet_close_signal.emit(closed)
+        return {'closed': closed}
+
+    def broadcast(self, action, kwargs):
+        if action not in self.BROADCAST_ACTIONS: raise ValueError(f"지원하지 않는 전송 종류: {action}")
+        if not isinstance(kwargs, dict): raise ValueError("kwargs 는 객체여야 합니다")
+        required, flags = self.BROADCAST_ACTIONS[action]
+        clean = {k: bool(kwargs[k]) for k in flags if k in kwargs}
+        if required:
+            value = kwargs.get(required)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"'{action}' 전송에는 문자열 '{required}' 인자가 필요합니다")
+            clean[required] = value
+        if action == 'key' and clean['key_combo'] not in self.KEY_COMBOS:
+            raise ValueError(f"지원하지 않는 키 조합: {clean['key_combo']} ({', '.join(self.KEY_COMBOS)})")
+        self.window.fleet_broadcast_signal.emit(action, clean)
+        return {'action': action, 'targets': len(self.list_profiles()), 'queued': True}
+
+# ==========================================
+# 이벤트 기록 (링 버퍼 + 비동기 파일 기록)
+# ==========================================
+LOG_DIR = APPDATA_DIR / 'logs'
+LEVEL_INFO, LEVEL_WARN, LEVEL_ERROR = 20, 30, 40
+LEVEL_NAMES = {LEVEL_INFO: 'INFO', LEVEL_WARN: 'WARN', LEVEL_ERROR: 'ERROR'}
+
+def classify_level(msg):
+    """메시지 앞의 이모지로 심각도 추정 (기존 log_signal 문자열을 그대로 받기 위함)"""
+    if msg.startswith(('❌', '💥', '🛑')): return LEVEL_ERROR
+    if msg.startswith(('⚠️', '🚫')): return LEVEL_WARN
+    return LEVEL_INFO
+
+class EventJournal:
+    """고정 크기 링 버퍼 이벤트 기록.
+    deque(maxlen) 의 append/copy 는 GIL 아래 원자적이라 어느 쓰레드에서든 락 없이 기록할 수 있다.
+    파일 기록은 별도 쓰레드가 flush_interval 마다 모아서 한 번에 쓰고, max_bytes 를 넘으면 순환한다.
+    flush 는 기록 쓰레드와 UI 쓰레드(close)에서 동시에 불릴 수 있어 파일 쓰기/순환만 잠금으로 묶는다."""
+    def __init__(self, capacity=5000, log_path=None, flush_interval=1.0, max_bytes=1 << 20, backups=3):
+        self.buffer = deque(maxlen=capacity)
+        self.pending = deque(maxlen=capacity * 4)
+        self.counter = itertools.count(1)
+        self.last_seq = 0
+        self.log_path = Path(log_path) if log_path else None
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        if self.log_path:
+            self.thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self.thread.start()
+
+    def log(self, msg, level=None):
+        entry = (next(self.counter), time.time(), level or classify_level(msg), msg)
+        self.buffer.append(entry)
+        if self.log_path: self.pending.append(entry)
+        self.last_seq = entry[0]
+        return entry
+
+    def latest(self):
+        try: return self.buffer[-1]
+        except IndexError: return None
+
+    def snapshot(self, since_seq=0):
+        entries = self.buffer.copy()
+        if since_seq and entries and entries[0][0] <= since_seq:
+            return [e for e in entries if e[0] > since_seq]
+        return list(entries)
+
+    @staticmethod
+    def format_entry(entry):
+        _, ts, level, msg = entry
+        return f"{time.strftime('%H:%M:%S', time.localtime(ts))}.{int(ts % 1 * 1000):03d} [{LEVEL_NAMES.get(level, level)}] {msg}"
+
+    def _rotate(self):
+        for i in range(self.backups - 1, 0, -1):
+            src = self.log_path.with_name(f"{self.log_path.stem}.{i}{self.log_path.suffix}")
+            if src.exists(): os.replace(src, self.log_path.with_name(f"{self.log_path.stem}.{i + 1}{self.log_path.suffix}"))
+        os.replace(self.log_path, self.log_path.with_name(f"{self.log_path.stem}.1{self.log_path.suffix}"))
+
+    def flush(self):
+        with self.flush_lock:
+            batch = []
+            while self.pending:
+                try: batch.append(self.pending.popleft())
+                except IndexError: break
+            if not batch: return
+            try:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                if self.log_path.exists() and self.log_path.stat().st_size >= self.max_bytes: self._rotate()
+                with open(self.log_path, 'a', encoding='utf-8') as f:
+                    f.write("\n".join(self.format_entry(e) for e in batch) + "\n")
+            except OSError: pass
+
+    def _writer_loop(self):
+        while not self.stop_event.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """기록 쓰레드를 멈추고 남은 항목을 모두 기록 (종료 직전 메시지까지 남도록 가장 마지막에 호출)"""
+        self.stop_event.set()
+        if self.thread: self.thread.join(2.0)
+        if self.log_path: self.flush()
+
+class LogHistoryPanel(QWidget):
+    """이벤트 기록 창. 새 항목만 덧붙이고 줄 수를 제한해 메시지가 많아도 가볍게 유지"""
+    def __init__(self, journal):
+        super().__init__()
+        self.journal = journal
+        self.shown_seq = 0
+        self.setWindowTitle("📜 이벤트 기록")
+        self.resize(560, 420)
+        self.setStyleSheet(Styles.MAIN_WINDOW)
+
+        layout = QVBoxLayout(self)
+        filter_lay = QHBoxLayout()
+        self.level_box = QComboBox()
+        for text, level in (("전체", LEVEL_INFO), ("경고 이상", LEVEL_WARN), ("오류만", LEVEL_ERROR)):
+            self.level_box.addItem(text, level)
+        self.text_filter = QLineEdit()
+        self.text_filter.setPlaceholderText("검색어 필터")
+        self.text_filter.setStyleSheet(Styles.INPUT)
+        filter_lay.addWidget(self.level_box)
+        filter_lay.addWidget(self.text_filter, stretch=1)
+        layout.addLayout(filter_lay)
+
+        self.view = QPlainTextEdit()
+        self.view.setReadOnly(True)
+        self.view.setMaximumBlockCount(journal.buffer.maxlen)
+        self.view.setFont(QFont("Consolas", 9))
+        layout.addWidget(self.view)
+
+        self.level_box.currentIndexChanged.connect(self.rebuild)
+        self.text_filter.textChanged.connect(self.rebuild)
+
+    def _matches(self, entry):
+        needle = self.text_filter.text().strip().lower()
+        return entry[2] >= self.level_box.currentData() and (not needle or needle in entry[3].lower())
+
+    def rebuild(self):
+        self.view.clear()
+        self.shown_seq = 0
+        self.refresh()
+
+    def refresh(self):
+        if self.journal.last_seq == self.shown_seq: return
+        entries = self.journal.snapshot(self.shown_seq)
+        if not entries: return
+        self.shown_seq = entries[-1][0]
+        lines = [EventJournal.format_entry(e) for e in entries if self._matches(e)]
+        if not lines: return
+        bar = self.view.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        self.view.appendPlainText("\n".join(lines))
+        if at_bottom: bar.setValue(bar.maximum())
+
+# ==========================================
+# 탭 일괄 작업 쓰레드 (devtools.py)
+# ==========================================
+class TabOpsThread(QThread):
+    """공유 디버깅 포트 하나에서 contexts(프로필 → browserContextId)에 속한 탭에만 작업을 동시에 수행"""
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal()
+
+    def __init__(self, op, contexts, port, index, pattern=None):
+        super().__init__()
+        self.op = op
+        self.contexts = dict(contexts)
+        self.port = port
+        self.index = index
+        self.pattern = pattern
+
+    def run(self):
+        manager = TabManager(f"127.0.0.1:{self.port}", self.contexts, index=self.index)
+        try:
+            if self.op == 'list': results, key, label = manager.list_tabs(), 'tabs', "탭 목록"
+            elif self.op == 'close': results, key, label = manager.close_matching(self.pattern), 'closed', f"'{self.pattern}' 탭 닫기"
+            elif self.op == 'reload': results, key, label = manager.reload_all(), 'reloaded', "전체 새로고침"
+            else: results, key, label = manager.freeze_background(), 'frozen', "백그라운드 탭 동결"
+        except (ValueError, OSError, DevToolsError) as e:
+            self.log_signal.emit(f"❌ 탭 작업 실패: {e}")
+            self.finished_signal.emit()
+            return
+        finally:
+            manager.close()
+
+        total = 0
+        for pid, res in sorted(results.items()):
+            if not res['ok']:
+                self.log_signal.emit(f"⚠️ Profile {pid} 탭 작업 실패: {res['error']}")
+                continue
+            count = len(res.get(key, []))
+            total += count
+            if self.op == 'list':
+                for tab in res['tabs']: self.log_signal.emit(f"🗂 Profile {pid}: {tab['url']}")
+            if res.get('failed'): self.log_signal.emit(f"⚠️ Profile {pid} {len(res['failed'])}개 탭 실패")
+        ok = sum(1 for r in results.values() if r['ok'])
+        self.log_signal.emit(f"✅ {label}: {ok}/{len(results)}개 프로필, {total}개 탭")
+        self.finished_signal.emit()
+
+# ==========================================
+# 미리보기 월 (썸네일 캐시, thumbcache.py)
+# ==========================================
+THUMB_W, THUMB_H = 160, 120
+
+class Win32CaptureBackend:
+    """PrintWindow 로 가려진 창까지 그린 뒤 썸네일 크기로 축소. signature 는 위치/제목/최소화 상태"""
+    PW_RENDERFULLCONTENT = 2
+
+    def __init__(self, profile_windows, width=THUMB_W, height=THUMB_H):
+        self.profile_windows = profile_windows
+        self.width, self.height = width, height
+
+    def signature(self, pid):
+        hwnd = self.profile_windows.get(pid)
+        try: return (hwnd, win32gui.IsIconic(hwnd), win32gui.GetWindowRect(hwnd), win32gui.GetWindowText(hwnd))
+        except: return None
+
+    def capture(self, pid):
+        hwnd = self.profile_windows.get(pid)
+        if not hwnd or not WindowUtils.is_window_valid(hwnd) or win32gui.IsIconic(hwnd): return None
+        left, top, right, bottom = win32gui.GetWindowRect(hwnd)
+        w, h = right - left, bottom - top
+        if w <= 0 or h <= 0: return None
+        hwnd_dc = win32gui.GetWindowDC(hwnd)
+        src_dc = win32ui.CreateDCFromHandle(hwnd_dc)
+        full_dc, thumb_dc = src_dc.CreateCompatibleDC(), src_dc.CreateCompatibleDC()
+        full_bmp, thumb_bmp = win32ui.CreateBitmap(), win32ui.CreateBitmap()
+        try:
+            full_bmp.CreateCompatibleBitmap(src_dc, w, h)
+            thumb_bmp.CreateCompatibleBitmap(src_dc, self.width, self.height)
+            full_dc.SelectObject(full_bmp)
+            thumb_dc.SelectObject(thumb_bmp)
+            ctypes.windll.user32.PrintWindow(hwnd, full_dc.GetSafeHdc(), self.PW_RENDERFULLCONTENT)
+            win32gui.SetStretchBltMode(thumb_dc.GetSafeHdc(), win32con.HALFTONE)
+            thumb_dc.StretchBlt((0, 0), (self.width, self.height), full_dc, (0, 0), (w, h), win32con.SRCCOPY)
+            bits = thumb_bmp.GetBitmapBits(True)
+            return bits if len(bits) == self.width * self.height * 4 else None
+        finally:
+            for bmp in (full_bmp, thumb_bmp):
+                try: win32gui.DeleteObject(bmp.GetHandle())
+                except: pass
+            full_dc.DeleteDC(); thumb_dc.DeleteDC(); src_dc.DeleteDC()
+            win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+class ThumbLabel(QLabel):
+    def __init__(self, profile_id, parent_window):
+        super().__init__()
+        self.profile_id = profile_id
+        self.parent_window = parent_window
+        self.setFixedSize(THUMB_W, THUMB_H + 18)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setStyleSheet(f"QLabel {{ background: {Theme.CARD_BG}; border: 1px solid {Theme.BORDER}; border-radius: 6px; color: {Theme.TEXT_SUB}; }}")
+        self.setText(f"Profile {profile_id}")
+        self.setToolTip(f"Profile {profile_id} (클릭: 활성화)")
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.MouseButton.LeftButton: self.parent_window.activate_profile(self.profile_id, focus=True)
+
+class PreviewWall(QWidget):
+    """관리 중인 모든 창의 썸네일. 캡처는 백그라운드 스케줄러가, 화면은 바뀐 썸네일만 다시 그린다"""
+    def __init__(self, parent_window):
+        super().__init__()
+        self.parent_window = parent_window
+        self.setWindowTitle("🖼 미리보기")
+        self.setStyleSheet(Styles.MAIN_WINDOW)
+        self.cache = ThumbnailCache(capacity=100, width=THUMB_W, height=THUMB_H)
+        self.scheduler = ThumbnailScheduler(Win32CaptureBackend(parent_window.profile_windows), self.cache,
+                                            lambda: sorted(parent_window.profile_windows), fps=4.0, frame_budget_ms=40.0)
+        self.grid = QGridLayout(self)
+        self.grid.setSpacing(4)
+        self.labels = {}
+        self.shown_versions = {}
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.refresh)
+
+    def rebuild(self, pids):
+        for label in self.labels.values(): label.deleteLater()
+        self.labels, self.shown_versions = {}, {}
+        cols = max(1, min(10, int(len(pids) ** 0.5 + 0.999)))
+        for i, pid in enumerate(pids):
+            label = ThumbLabel(pid, self.parent_window)
+            self.labels[pid] = label
+            self.grid.addWidget(label, i // cols, i % cols)
+        self.adjustSize()
+
+    def refresh(self):
+        pids = sorted(self.parent_window.profile_windows)
+        if pids != sorted(self.labels): self.rebuild(pids)
+        for pid, label in self.labels.items():
+            if self.cache.version(pid) == self.shown_versions.get(pid): continue
+            got = self.cache.get(pid)
+            if not got: continue
+            data, version = got
+            image = QImage(data, THUMB_W, THUMB_H, THUMB_W * 4, QImage.Format.Format_RGB32).copy()
+            label.setPixmap(QPixmap.fromImage(image))
+            self.shown_versions[pid] = version
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.scheduler.start()
+        self.timer.start(250)
+
+    def closeEvent(self, event):
+        self.timer.stop()
+        self.scheduler.stop()
+        super().closeEvent(event)
+
 # ==========================================
 # UI 컴포넌트
 # ==========================================
@@ -588,6 +1866,11 @@ class GridButton(QPushButton):
         self.parent_window.set_always_on_top(False); self.update_style()
 
 class LauncherWindow(QMainWindow):
+    settings_error_signal = pyqtSignal(str)
+    fleet_launch_signal = pyqtSignal(list)
+    fleet_close_signal = pyqtSignal(list)
+    fleet_broadcast_signal = pyqtSignal(str, dict)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Edge Multi-Launcher PRO (Stable v2.2)")
@@ -596,28 +1879,55 @@ class LauncherWindow(QMainWindow):
         self.click_capture_mode = False
         self.click_capture_source_hwnd = None
         
-        self.hotkey_monitor = GlobalHotkeyMonitor(self.on_f2_pressed)
+        self.journal = EventJournal(log_path=LOG_DIR / 'events.log')
+        self.history_panel = None
+        self.preview_wall = None
+        self.settings = SettingsStore(CONFIG_FILE, on_error=self.settings_error_signal.emit)
+        
+        capture_key = self.settings.get('hotkeys', {}).get('click_capture', 'F2')
+        self.hotkey_monitor = GlobalHotkeyMonitor(self.on_f2_pressed, getattr(win32con, f"VK_{capture_key}", win32con.VK_F2))
         self.hotkey_monitor.start()
         
         calc_width = (BTN_SIZE * 10) + (H_SPACING * 9) + 20 + (WINDOW_LR_MARGIN * 2) + 4
         
-        saved = AppDataConfig.load_window_position()
-        if saved: 
-            self.setGeometry(saved[0], saved[1], calc_width, saved[3])
+        saved = self.settings.get('window')
+        if saved and all(k in saved for k in ('x', 'y', 'height')): 
+            self.setGeometry(saved['x'], saved['y'], calc_width, saved['height'])
         else: 
             self.setGeometry(100, 100, calc_width, 640)
         
         self.setFixedWidth(calc_width) 
         self.init_ui()
+        self.settings_error_signal.connect(lambda msg: self.log(f"⚠️ {msg}"))
+        if self.settings.last_error: self.log(f"⚠️ {self.settings.last_error}")
+        self.pending_relaunch = []
+        self.launch_options = {}
+        self.supervisor = ProfileSupervisor()
+        self.supervisor.close_hung = bool(self.settings.get('supervisor', {}).get('close_hung_windows'))
+        self.supervisor.log_signal.connect(self.log)
+        self.supervisor.relaunch_signal.connect(self.relaunch_profile)
+        self.supervisor.metrics_signal.connect(self.on_profile_metrics)
+        self.supervisor.start()
+        self.fleet_agent = None
+        self.tab_index = TabIndex()
+        self.devtools_contexts = {}   # 프로필 번호 → browserContextId (런처로 실행할 때 기록)
+        self.fleet_launch_signal.connect(self.on_fleet_launch)
+        self.fleet_close_signal.connect(lambda ids: [self.close_profile(p) for p in ids])
+        self.fleet_broadcast_signal.connect(self.on_fleet_broadcast)
         self.check_timer = QTimer()
         self.check_timer.timeout.connect(self.check_windows_status)
         self.check_timer.start(200)
+        # 상태 표시는 초당 10회까지만 갱신 (쓰레드 메시지가 몰려도 라벨 재그리기 폭주 방지)
+        self.shown_seq = 0
+        self.log_timer = QTimer()
+        self.log_timer.timeout.connect(self.refresh_log_view)
+        self.log_timer.start(100)
 
     def on_f2_pressed(self):
         if not self.click_capture_mode:
             self.click_capture_mode = True
             self.click_capture_source_hwnd = None
-            self.status.setText("🎯 F2 활성 - 관리 중인 브라우저를 클릭하세요 (ESC: 취소)")
+            self.log("🎯 F2 활성 - 관리 중인 브라우저를 클릭하세요 (ESC: 취소)")
 
     def set_always_on_top(self, on):
         hwnd = int(self.winId()); flag = win32con.HWND_TOPMOST if on else win32con.HWND_NOTOPMOST
@@ -650,9 +1960,16 @@ class LauncherWindow(QMainWindow):
         header_layout.addWidget(header) 
         header_layout.addStretch()  
         header_layout.addWidget(btn_help) 
+        btn_history = QPushButton("📜"); btn_history.setFixedSize(28, 28); btn_history.setStyleSheet(Styles.BTN_CMD); btn_history.setToolTip("이벤트 기록")
+        btn_history.clicked.connect(self.show_history_panel)
+        header_layout.addWidget(btn_history)
+        btn_preview = QPushButton("🖼"); btn_preview.setFixedSize(28, 28); btn_preview.setStyleSheet(Styles.BTN_CMD); btn_preview.setToolTip("미리보기")
+        btn_preview.clicked.connect(self.show_preview_wall)
+        header_layout.addWidget(btn_preview)
         
         layout.addLayout(header_layout)
         layout.addWidget(self._create_control_card())
+        layout.addLayout(self._create_group_bar())
         
         grid_card = QFrame(); grid_card.setStyleSheet(Styles.CARD)
         grid_lay = QVBoxLayout(grid_card)
@@ -678,6 +1995,8 @@ class LauncherWindow(QMainWindow):
         btn_lay.addWidget(self._create_btn("전체 활성화", Theme.PRIMARY, self.activate_all_browsers))
         btn_lay.addWidget(self._create_btn("전체 최소화", Theme.ACCENT, self.minimize_all_browsers))
         btn_lay.addWidget(self._create_btn("전체 종료", Theme.DANGER, self.close_all_managed))
+        self.btn_supervise = self._create_btn("🛡 복구 OFF", Theme.TEXT_SUB, self.toggle_auto_relaunch)
+        btn_lay.addWidget(self.btn_supervise)
         layout.addLayout(btn_lay)
         
         self.status = QLabel("Ready"); self.status.setAlignment(Qt.AlignmentFlag.AlignCenter); self.status.setStyleSheet(Styles.LABEL_SUB); layout.addWidget(self.status)
@@ -716,6 +2035,13 @@ class LauncherWindow(QMainWindow):
             ("↵ 엔터포함", lambda: self.send_text_to_all(True), Theme.SUCCESS),
             ("🔃 F5", lambda: self.send_shortcut("f5"), Theme.SURFACE),
             ("🔧 F12", self.send_f12, Theme.SURFACE),
+
+            ("🚚 URL분배", self.distribute_urls, Theme.ACTIVE),
+            ("🧾 템플릿", self.send_template_to_all, Theme.SPECIAL),
+            ("⏺ 녹화", self.toggle_macro_recording, Theme.DANGER),
+            ("▶ 재생", self.replay_macro, Theme.SUCCESS),
+            ("🌐 원격", self.toggle_fleet_agent, Theme.TEXT_SUB),
+            ("🗂 탭관리", self.show_tab_menu, Theme.SURFACE),
         ]
 
         right_grid = QGridLayout()
@@ -736,41 +2062,246 @@ class LauncherWindow(QMainWindow):
         
         return card
 
+    def _create_group_bar(self):
+        bar = QHBoxLayout()
+        bar.setSpacing(4)
+        title = QLabel("👥 대상")
+        title.setStyleSheet(f"color: {Theme.PRIMARY}; font-weight: bold; border:none; font-size: 12px;")
+        bar.addWidget(title)
+        self.group_combo = QComboBox()
+        self.group_combo.setStyleSheet(f"QComboBox {{ border: 1px solid {Theme.BORDER}; border-radius: 6px; padding: 3px 8px; background: white; font-size: 12px; }}")
+        self.group_combo.setToolTip("전송/활성화/최소화 대상을 그룹으로 제한")
+        bar.addWidget(self.group_combo, stretch=1)
+        for text, func, tip in (("💾", self.save_group, "체크된(없으면 실행 중인) 프로필을 그룹으로 저장"),
+                                ("🎯", self.set_group_targets, "체크된 프로필을 이 그룹의 전송 대상으로 지정 (체크 없으면 그룹 전체)"),
+                                ("🚀", self.launch_group, "그룹 일괄 실행 및 배치"),
+                                ("🗑", self.delete_group, "그룹 삭제")):
+            b = QPushButton(text); b.setFixedSize(32, 28); b.setStyleSheet(Styles.BTN_CMD); b.setToolTip(tip)
+            b.clicked.connect(func)
+            bar.addWidget(b)
+        self.reload_groups()
+        return bar
+
     def _create_btn(self, text, color, func):
         btn = QPushButton(text); btn.setFixedHeight(35); btn.clicked.connect(func); btn.setStyleSheet(f"QPushButton {{ background-color: {color}; color: white; font-weight: bold; border-radius: 8px; border: none; font-size: 11px; }} QPushButton:hover {{ opacity: 0.9; }}"); return btn
 
+    def log(self, msg):
+        """모든 쓰레드의 상태 메시지 진입점. 기록만 하고 화면 갱신은 refresh_log_view 가 모아서 처리"""
+        self.journal.log(msg)
+
+    def refresh_log_view(self):
+        if self.journal.last_seq == self.shown_seq: return
+        entry = self.journal.latest()
+        if entry:
+            self.shown_seq = entry[0]
+            self.status.setText(entry[3])
+        if self.history_panel and self.history_panel.isVisible(): self.history_panel.refresh()
+
+    def show_history_panel(self):
+        if not self.history_panel: self.history_panel = LogHistoryPanel(self.journal)
+        self.history_panel.rebuild()
+        self.history_panel.show(); self.history_panel.raise_(); self.history_panel.activateWindow()
+
+    def show_preview_wall(self):
+        if not self.preview_wall: self.preview_wall = PreviewWall(self)
+        self.preview_wall.show(); self.preview_wall.raise_()
+
+    def reload_groups(self, select=None):
+        current = select if select is not None else self.group_combo.currentData()
+        self.group_combo.blockSignals(True)
+        self.group_combo.clear()
+        self.group_combo.addItem("전체", None)
+        for name in sorted(self.settings.get('groups', {})):
+            self.group_combo.addItem(name, name)
+        idx = self.group_combo.findData(current)
+        self.group_combo.setCurrentIndex(max(idx, 0))
+        self.group_combo.blockSignals(False)
+
+    def current_group(self):
+        name = self.group_combo.currentData()
+        return self.settings.get('groups', {}).get(name) if name else None
+
+    def target_windows(self):
+        """현재 선택된 그룹의 전송 대상 창만 (전체면 모든 관리 창)"""
+        group = self.current_group()
+        if not group: return self.profile_windows
+        targets = set(group.get('targets') or group.get('profiles', []))
+        return {p: h for p, h in self.profile_windows.items() if p in targets}
+
+    def resolve_layout(self, group):
+        layout = group.get('layout')
+        if isinstance(layout, str): layout = self.settings.get('layouts', {}).get(layout)
+        if not isinstance(layout, dict): return None
+        return dict(layout, ids=sorted(group.get('profiles', [])))
+
+    def save_group(self):
+        sel = sorted(i for i, b in self.buttons.items() if b.isChecked()) or sorted(self.profile_windows)
+        if not sel:
+            self.log("⚠️ 그룹으로 저장할 프로필이 없습니다 (체크하거나 실행하세요)")
+            return
+        name, ok = QInputDialog.getText(self, "그룹 저장", f"그룹 이름 ({len(sel)}개 프로필):", text=self.group_combo.currentData() or "")
+        name = name.strip()
+        if not ok or not name: return
+        groups = self.settings.get('groups', {})
+        group = normalize_group(groups.get(name)) or {'layout': None, 'flags': []}
+        group['profiles'] = sel
+        # 따로 지정한 전송 대상(🎯)은 다시 저장해도 유지하되, 그룹에서 빠진 프로필은 제외
+        if group.get('targets'): group['targets'] = [p for p in group['targets'] if p in sel]
+        if not group.get('targets'): group.pop('targets', None)
+        self.settings.update('groups', **{name: group})
+        self.reload_groups(select=name)
+        self.log(f"💾 그룹 '{name}' 저장 ({len(sel)}개 프로필)")
+
+    def set_group_targets(self):
+        name = self.group_combo.currentData()
+        group = normalize_group(self.current_group())
+        if not group:
+            self.log("⚠️ 전송 대상을 지정할 그룹을 선택하세요")
+            return
+        sel = sorted(i for i, b in self.buttons.items() if b.isChecked())
+        if sel: group['targets'] = sel
+        else: group.pop('targets', None)
+        self.settings.update('groups', **{name: group})
+        self.log(f"🎯 그룹 '{name}' 전송 대상: {sel if sel else '그룹 전체'}")
+
+    def delete_group(self):
+        name = self.group_combo.currentData()
+        if not name: return
+        if QMessageBox.question(self, "확인", f"그룹 '{name}' 삭제?") != QMessageBox.StandardButton.Yes: return
+        groups = self.settings.get('groups', {})
+        groups.pop(name, None)
+        self.settings.set('groups', groups)
+        self.reload_groups(select=None)
+
+    def launch_group(self):
+        name, group = self.group_combo.currentData(), self.current_group()
+        if not group or not group.get('profiles'):
+            self.log("⚠️ 실행할 그룹을 선택하세요")
+            return
+        if getattr(self, 'thread', None) and self.thread.isRunning():
+            self.log("⚠️ 다른 실행이 진행 중입니다")
+            return
+        self.log(f"👥 그룹 '{name}' 일괄 실행")
+        self.start_launch(group['profiles'], layout=self.resolve_layout(group), flags=group.get('flags'), batch=True)
+
     def activate_all_browsers(self):
-        for h in [h for h in self.profile_windows.values() if WindowUtils.is_window_valid(h)]: WindowUtils.bring_to_front(h, focus=True); time.sleep(0.05)
+        for h in [h for h in self.target_windows().values() if WindowUtils.is_window_valid(h)]: WindowUtils.bring_to_front(h, focus=True); time.sleep(0.05)
 
     def minimize_all_browsers(self):
-        for h in [h for h in self.profile_windows.values() if WindowUtils.is_window_valid(h)]:
+        for h in [h for h in self.target_windows().values() if WindowUtils.is_window_valid(h)]:
             try: win32gui.ShowWindow(h, win32con.SW_MINIMIZE)
             except: pass
 
     def send_url_to_all(self, new_tab=False):
         url = self.unified_input.toPlainText().strip()
         if not url: return
-        self.sync_thread = SyncThread('url', self.profile_windows, url=url, new_tab=new_tab)
-        self.sync_thread.log_signal.connect(self.status.setText)
+        recorder = getattr(self, 'macro_recorder', None)
+        if recorder and recorder.isRunning() and recorder.source_hwnd:
+            # 녹화 중에는 소스 창에만 이동하고 URL 단계로 기록
+            recorder.add_url(url, new_tab)
+            targets = {p: h for p, h in self.profile_windows.items() if h == recorder.source_hwnd}
+            recorder.pause_keys()
+            self.sync_thread = SyncThread('url', targets, url=url, new_tab=new_tab)
+            self.sync_thread.finished.connect(recorder.resume_keys)
+            self.sync_thread.start()
+            return
+        self.sync_thread = SyncThread('url', self.target_windows(), url=url, new_tab=new_tab)
+        self.sync_thread.log_signal.connect(self.log)
         self.sync_thread.start()
 
+    def distribute_urls(self):
+        """입력창의 URL 목록(여러 줄) 또는 파일을 실행 중인 프로필에 라운드로빈 분배. 실행 중 다시 누르면 중단"""
+        if getattr(self, 'distributor', None) and self.distributor.isRunning():
+            self.distributor.stop()
+            return
+        text = self.unified_input.toPlainText().strip()
+        if text:
+            source = iter_url_source(text=text)
+        else:
+            path, _ = QFileDialog.getOpenFileName(self, "URL 목록 파일", "", "Text (*.txt *.csv);;All (*)")
+            if not path: return
+            source = iter_url_source(path=path)
+        timing = self.settings.get('timing', {}).get('url_distribute', {})
+        timing = {k: v for k, v in timing.items() if k in ('max_retries', 'load_timeout', 'min_dwell')}
+        self.distributor = UrlDistributorThread(source, self.target_windows(), **timing)
+        self.distributor.log_signal.connect(self.log)
+        self.distributor.start()
+
     def send_text_to_all(self, with_enter=False):
         text = self.unified_input.toPlainText().strip()
         if not text: 
-            self.status.setText("⚠️ 전송할 텍스트가 없습니다")
+            self.log("⚠️ 전송할 텍스트가 없습니다")
             return
-        self.sync_thread = SyncThread('text', self.profile_windows, text=text, send_enter=with_enter)
-        self.sync_thread.log_signal.connect(self.status.setText)
+        self.sync_thread = SyncThread('text', self.target_windows(), text=text, send_enter=with_enter)
+        self.sync_thread.log_signal.connect(self.log)
         self.sync_thread.start()
 
+    def send_template_to_all(self):
+        """입력창 내용을 템플릿({profile_id}, {컬럼명})으로 CSV/JSONL 각 행을 해당 프로필에 전송"""
+        if getattr(self, 'template_thread', None) and self.template_thread.isRunning():
+            self.log("⚠️ 템플릿 전송이 아직 진행 중입니다")
+            return
+        template = self.unified_input.toPlainText().strip()
+        if not template:
+            self.log("⚠️ 템플릿을 입력하세요 (예: {profile_id} {keyword})")
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "데이터 파일", "", "Data (*.csv *.jsonl *.ndjson);;All (*)")
+        if not path: return
+        # 오래 걸리므로 다른 전송이 self.sync_thread 를 덮어써도 실행 중인 쓰레드가 수거되지 않게 따로 보관
+        self.template_thread = TemplateBroadcastThread(template, path, self.target_windows())
+        self.template_thread.log_signal.connect(self.log)
+        self.template_thread.errors_signal.connect(self.show_template_errors)
+        self.template_thread.start()
+
+    def show_template_errors(self, errors):
+        shown = errors[:30]
+        more = f"\n... 외 {len(errors) - len(shown)}건" if len(errors) > len(shown) else ""
+        QMessageBox.warning(self, "템플릿 전송 오류", "\n".join(shown) + more)
+
+    def toggle_macro_recording(self):
+        recorder = getattr(self, 'macro_recorder', None)
+        if not (recorder and recorder.isRunning()):
+            self.macro_recorder = MacroRecorderThread(self.profile_windows)
+            self.macro_recorder.log_signal.connect(self.log)
+            self.macro_recorder.start()
+            return
+        recorder.stop(); recorder.wait(500)
+        if not recorder.steps:
+            self.log("⚠️ 기록된 단계 없음")
+            return
+        MACRO_DIR.mkdir(parents=True, exist_ok=True)
+        path, _ = QFileDialog.getSaveFileName(self, "매크로 저장", str(MACRO_DIR / "macro.emm"), "Macro (*.emm)")
+        if not path: return
+        try:
+            save_macro(path, recorder.steps, recorder.source_size)
+            self.log(f"💾 매크로 저장 ({len(recorder.steps)}단계)")
+        except OSError as e:
+            self.log(f"❌ 매크로 저장 실패: {e}")
+
+    def replay_macro(self):
+        replay = getattr(self, 'macro_replay', None)
+        if replay and replay.isRunning():
+            replay.stop()
+            return
+        path, _ = QFileDialog.getOpenFileName(self, "매크로 열기", str(MACRO_DIR), "Macro (*.emm);;All (*)")
+        if not path: return
+        try: steps = load_macro(path)
+        except (OSError, ValueError, KeyError) as e:
+            self.log(f"❌ 매크로 불러오기 실패: {e}")
+            return
+        self.macro_replay = MacroReplayThread(steps, self.target_windows())
+        self.macro_replay.log_signal.connect(self.log)
+        self.macro_replay.report_signal.connect(lambda r: QMessageBox.information(self, "매크로 단계별 소요 시간", r))
+        self.macro_replay.start()
+
     def send_f12(self):
-        self.sync_thread = SyncThread('f12', self.profile_windows)
-        self.sync_thread.log_signal.connect(self.status.setText)
+        self.sync_thread = SyncThread('f12', self.target_windows())
+        self.sync_thread.log_signal.connect(self.log)
         self.sync_thread.start()
 
     def send_shortcut(self, key):
-        self.sync_thread = SyncThread('key', self.profile_windows, key_combo=key)
-        self.sync_thread.log_signal.connect(self.status.setText)
+        self.sync_thread = SyncThread('key', self.target_windows(), key_combo=key)
+        self.sync_thread.log_signal.connect(self.log)
         self.sync_thread.start()
 
     def check_windows_status(self):
@@ -778,7 +2309,7 @@ class LauncherWindow(QMainWindow):
             if self.click_capture_mode and not self.click_capture_source_hwnd:
                 if win32api.GetAsyncKeyState(win32con.VK_ESCAPE) & 0x8000:
                     self.click_capture_mode = False
-                    self.status.setText("🚫 동기화 취소됨 (ESC)")
+                    self.log("🚫 동기화 취소됨 (ESC)")
                     return
 
                 try:
@@ -791,15 +2322,15 @@ class LauncherWindow(QMainWindow):
                         if root_hwnd in self.profile_windows.values():
                             self.click_capture_source_hwnd = root_hwnd
                             client_pt = win32gui.ScreenToClient(root_hwnd, cursor_pos)
-                            self.status.setText(f"✅ 좌표 캡처: ({client_pt[0]}, {client_pt[1]}) - 전송 중...")
-                            self.sync_thread = SyncThread('click', self.profile_windows, rel_x=client_pt[0], rel_y=client_pt[1])
-                            self.sync_thread.log_signal.connect(self.status.setText)
+                            self.log(f"✅ 좌표 캡처: ({client_pt[0]}, {client_pt[1]}) - 전송 중...")
+                            self.sync_thread = SyncThread('click', self.target_windows(), rel_x=client_pt[0], rel_y=client_pt[1])
+                            self.sync_thread.log_signal.connect(self.log)
                             self.sync_thread.start()
                             self.click_capture_mode = False
                             time.sleep(0.2)
                         else:
                             self.click_capture_mode = False
-                            self.status.setText("🚫 동기화 취소됨 (외부 클릭)")
+                            self.log("🚫 동기화 취소됨 (외부 클릭)")
                             time.sleep(0.2)
                 except: pass
             
@@ -831,19 +2362,123 @@ class LauncherWindow(QMainWindow):
 
     def run_batch(self):
         sel = [i for i, b in self.buttons.items() if b.isChecked()]
-        if not sel: self.status.setText("⚠️ 선택된 프로필 없음"); return
+        if not sel: self.log("⚠️ 선택된 프로필 없음"); return
+        self.start_launch(sel)
+
+    def start_launch(self, ids, layout=None, flags=None, batch=False):
+        # 그룹 배치/실행 옵션은 프로필별로 기억해 두었다가 자동 재실행 때 같은 칸에 다시 띄움
+        for p in ids:
+            if layout or flags: self.launch_options[p] = {'layout': layout, 'flags': flags}
+            else: self.launch_options.pop(p, None)
         self.btn_launch.setEnabled(False)
-        self.thread = LauncherThread(sel, self.profile_windows)
-        self.thread.log_signal.connect(self.status.setText)
-        self.thread.profile_launched_signal.connect(lambda p, h: self.profile_windows.update({p: h}))
-        self.thread.finished_signal.connect(lambda: (self.btn_launch.setEnabled(True), self.check_windows_status()))
+        self.thread = LauncherThread(ids, self.profile_windows, devtools_port=self.devtools_port(),
+                                     layout=layout, extra_flags=flags, batch=batch)
+        self.thread.log_signal.connect(self.log)
+        self.thread.profile_launched_signal.connect(self.on_profile_launched)
+        self.thread.context_signal.connect(self.devtools_contexts.__setitem__)
+        self.thread.finished_signal.connect(self.on_launch_finished)
         self.thread.start()
 
+    def on_profile_launched(self, pid, hwnd):
+        self.profile_windows[pid] = hwnd
+        self.supervisor.track(pid, hwnd)
+
+    def on_launch_finished(self):
+        self.btn_launch.setEnabled(True)
+        self.check_windows_status()
+        if self.pending_relaunch:
+            opts = self.launch_options.get(self.pending_relaunch[0], {})
+            ids = [p for p in self.pending_relaunch if self.launch_options.get(p, {}) == opts]
+            self.pending_relaunch = [p for p in self.pending_relaunch if p not in ids]
+            self.start_launch(ids, **opts)
+
+    def toggle_fleet_agent(self):
+        """다른 PC의 코디네이터(fleet.py)가 이 런처를 제어할 수 있도록 TCP 에이전트 시작/중지"""
+        if self.fleet_agent:
+            self.fleet_agent.stop(); self.fleet_agent = None
+            self.log("🌐 원격 에이전트 중지")
+            return
+        cfg = self.settings.get('fleet', {})
+        try:
+            self.fleet_agent = FleetAgent(LauncherAgentBackend(self), host=cfg.get('host', '127.0.0.1'),
+                                          port=int(cfg.get('port', FLEET_DEFAULT_PORT)), token=cfg.get('token')).start()
+            self.log(f"🌐 원격 에이전트 실행 중: {self.fleet_agent.address}")
+        except (OSError, ValueError, FleetError) as e:
+            self.fleet_agent = None
+            self.log(f"❌ 원격 에이전트 시작 실패: {e}")
+
+    def devtools_port(self):
+        cfg = self.settings.get('devtools', {})
+        return int(cfg.get('port', 9300)) if cfg.get('enabled') else None
+
+    def show_tab_menu(self):
+        menu = QMenu(self)
+        for text, op in (("🗂 탭 목록", 'list'), ("✖️ 입력창 URL 패턴과 일치하는 탭 닫기", 'close'),
+                         ("🔃 모든 탭 새로고침", 'reload'), ("🧊 백그라운드 탭 동결 (CPU 절약, 메모리 유지)", 'freeze')):
+            act = menu.addAction(text)
+            act.triggered.connect(lambda _, op=op: self.run_tab_op(op))
+        menu.exec(QCursor.pos())
+
+    def run_tab_op(self, op):
+        port = self.devtools_port()
+        if not port:
+            self.log("⚠️ 설정 파일의 devtools.enabled 를 켜고 프로필을 다시 실행해야 탭 작업을 쓸 수 있습니다")
+            return
+        pattern = self.unified_input.toPlainText().strip() if op == 'close' else None
+        if op == 'close' and not pattern:
+            self.log("⚠️ 닫을 탭의 URL 패턴을 입력하세요 (부분 문자열, * 와일드카드, re:정규식)")
+            return
+        if pattern:
+            try: url_matcher(pattern)
+            except ValueError as e:
+                self.log(f"❌ {e}")
+                return
+        pids = [p for p, h in self.target_windows().items() if WindowUtils.is_window_valid(h)]
+        unmapped = [p for p in pids if p not in self.devtools_contexts]
+        if unmapped:
+            self.log(f"⚠️ 디버깅 컨텍스트가 없는 프로필은 제외: {unmapped} (Edge 를 모두 닫고 런처로 다시 실행)")
+        contexts = {p: self.devtools_contexts[p] for p in pids if p in self.devtools_contexts}
+        if not contexts: return
+        self.tab_thread = TabOpsThread(op, contexts, port, self.tab_index, pattern=pattern)
+        self.tab_thread.log_signal.connect(self.log)
+        self.tab_thread.start()
+
+    def on_fleet_launch(self, ids):
+        if getattr(self, 'thread', None) and self.thread.isRunning():
+            self.pending_relaunch.extend(p for p in ids if p not in self.pending_relaunch)
+            return
+        self.start_launch(ids)
+
+    def on_fleet_broadcast(self, action, kwargs):
+        self.sync_thread = SyncThread(action, self.profile_windows, **kwargs)
+        self.sync_thread.log_signal.connect(self.log)
+        self.sync_thread.start()
+
+    def on_profile_metrics(self, pid, text):
+        if pid in self.buttons: self.buttons[pid].setToolTip(text)
+
+    def relaunch_profile(self, pid):
+        """감시자가 요청한 재실행. 기존 실행 경로(LauncherThread)로 원래 배치 칸에 다시 띄운다"""
+        # 예전 창 핸들이 남아 있으면 LauncherThread 가 새로 띄우지 않고 그 창을 재배치만 하므로 먼저 지운다
+        self.profile_windows.pop(pid, None)
+        if getattr(self, 'thread', None) and self.thread.isRunning():
+            if pid not in self.pending_relaunch: self.pending_relaunch.append(pid)
+            return
+        self.start_launch([pid], **self.launch_options.get(pid, {}))
+
+    def toggle_auto_relaunch(self):
+        self.supervisor.auto_relaunch = not self.supervisor.auto_relaunch
+        on = self.supervisor.auto_relaunch
+        self.btn_supervise.setText("🛡 복구 ON" if on else "🛡 복구 OFF")
+        color = Theme.SUCCESS if on else Theme.TEXT_SUB
+        self.btn_supervise.setStyleSheet(f"QPushButton {{ background-color: {color}; color: white; font-weight: bold; border-radius: 8px; border: none; font-size: 11px; }} QPushButton:hover {{ opacity: 0.9; }}")
+
     def activate_profile(self, pid, focus=True):
         if pid in self.profile_windows: WindowUtils.bring_to_front(self.profile_windows[pid], focus=focus)
 
     def close_profile(self, pid):
         if pid in self.profile_windows:
+            self.supervisor.mark_user_close(pid)
             try: win32gui.PostMessage(self.profile_windows[pid], win32con.WM_CLOSE, 0, 0)
             except: pass
 
@@ -852,21 +2487,36 @@ class LauncherWindow(QMainWindow):
         if pids and QMessageBox.question(self, "확인", f"{len(pids)}개 브라우저 종료?") == QMessageBox.StandardButton.Yes:
             for p in pids: self.close_profile(p)
 
-    def save_pos(self): g = self.geometry(); AppDataConfig.save_window_position(g.x(), g.y(), g.width(), g.height())
+    def save_pos(self):
+        g = self.geometry()
+        self.settings.set('window', {'x': g.x(), 'y': g.y(), 'width': g.width(), 'height': g.height()})
 
     def closeEvent(self, e):
         self.check_timer.stop()
         self.hotkey_monitor.stop()
+        if self.preview_wall: self.preview_wall.close()
         pids = list(self.profile_windows.keys())
         if pids:
             rep = QMessageBox.question(self, "종료 확인", f"런처 종료 시 관리 중인 {len(pids)}개의 브라우저도 모두 종료하시겠습니까?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
             if rep == QMessageBox.StandardButton.Yes:
                 for p in pids: self.close_profile(p)
-                self.save_pos(); e.accept()
+                self.stop_workers(); self.save_pos(); self.settings.close(); e.accept()
             else: 
                 self.check_timer.start(200)
                 e.ignore()
-        else: self.save_pos(); e.accept()
+        else: self.stop_workers(); self.save_pos(); self.settings.close(); e.accept()
+
+    def stop_workers(self):
+        # 종료가 확정된 뒤에만 멈춘다 (취소하면 감시자/원격 에이전트가 그대로 계속 동작)
+        if self.fleet_agent: self.fleet_agent.stop(); self.fleet_agent = None
+        distributor = getattr(self, 'distributor', None)
+        if distributor and distributor.isRunning():
+            distributor.stop()
+            distributor.wait(3000)
+        # 점검 한 번이 응답없는 창마다 최대 1초 걸리므로 넉넉히 기다린다
+        self.supervisor.stop()
+        self.supervisor.wait(3000)
+        self.journal.close()
 
     def moveEvent(self, e): super().moveEvent(e); self.save_pos()
     def resizeEvent(self, e): super().resizeEvent(e); self.save_pos()
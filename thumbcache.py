@@ -0,0 +1,231 @@
+"""관리 중인 창들의 저해상도 썸네일 캐시 (미리보기 월).
+
+- FramePool: 썸네일 크기 고정 슬롯들을 하나의 bytearray 에 미리 잡아두고 재사용 (캡처마다 할당하지 않음)
+- ThumbnailCache: 슬롯을 키(프로필)별로 빌려주는 LRU 캐시. 내용 해시가 같으면 갱신하지 않는다
+- ThumbnailScheduler: 백그라운드에서 fps 와 프레임당 시간 예산 안에서만 라운드로빈으로 캡처
+- 캡처 백엔드는 capture(key) → 썸네일 크기 BGRA bytes (실패 시 None) 와 선택적 signature(key) 만 있으면 되며,
+  signature 가 직전과 같고 max_stale 이 지나지 않았으면 캡처 자체를 건너뛴다
+
+표준 라이브러리만 사용하며 FakeCaptureBackend 로 창 없이 벤치마크할 수 있다:
+    python thumbcache.py bench --windows 50 --seconds 3
+"""
+import sys
+import time
+import zlib
+import argparse
+import threading
+from collections import OrderedDict
+
+BYTES_PER_PIXEL = 4   # BGRA (QImage.Format_RGB32 와 동일한 배치)
+
+class FramePool:
+    """slot_count 개의 고정 크기 프레임 버퍼. 슬롯은 같은 bytearray 를 가리키는 memoryview"""
+    def __init__(self, slot_count, width, height):
+        self.width, self.height = width, height
+        self.slot_bytes = width * height * BYTES_PER_PIXEL
+        self.buffer = bytearray(self.slot_bytes * slot_count)
+        view = memoryview(self.buffer)
+        self.slots = [view[i * self.slot_bytes:(i + 1) * self.slot_bytes] for i in range(slot_count)]
+        self.free = list(range(slot_count - 1, -1, -1))
+
+    def acquire(self):
+        return self.free.pop() if self.free else None
+
+    def release(self, idx):
+        self.free.append(idx)
+
+def frame_digest(data):
+    """프레임 전체의 CRC32. 썸네일 크기(수십 KB)에서는 수십 µs 라 표본 추출보다 안전하다"""
+    return zlib.crc32(data)
+
+class ThumbnailCache:
+    """키별 썸네일을 FramePool 슬롯에 보관하는 LRU 캐시 (용량 초과 시 가장 오래 안 본 항목부터 반납)"""
+    def __init__(self, capacity=64, width=192, height=108):
+        self.pool = FramePool(capacity, width, height)
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()   # key → {'slot', 'digest', 'version', 'updated'}
+        self.stats = {'stored': 0, 'unchanged': 0, 'evicted': 0}
+
+    @property
+    def size(self):
+        return self.pool.width, self.pool.height
+
+    def put(self, key, data):
+        """data 는 width*height BGRA 바이트. 내용이 바뀌지 않았으면 False"""
+        if len(data) != self.pool.slot_bytes:
+            raise ValueError(f"프레임 크기 불일치: {len(data)} != {self.pool.slot_bytes}")
+        digest = frame_digest(data)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry['digest'] == digest:
+                entry['updated'] = time.time()
+                self.entries.move_to_end(key)
+                self.stats['unchanged'] += 1
+                return False
+            if entry is None:
+                slot = self.pool.acquire()
+                if slot is None:
+                    _, old = self.entries.popitem(last=False)
+                    slot = old['slot']
+                    self.stats['evicted'] += 1
+                entry = self.entries[key] = {'slot': slot, 'digest': None, 'version': 0, 'updated': 0.0}
+            self.pool.slots[entry['slot']][:] = data
+            entry['digest'] = digest
+            entry['version'] += 1
+            entry['updated'] = time.time()
+            self.entries.move_to_end(key)
+            self.stats['stored'] += 1
+            return True
+
+    def version(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry['version'] if entry else 0
+
+    def get(self, key):
+        """(bytes, version) 또는 None. 복사본을 돌려주므로 캡처 쓰레드가 슬롯을 덮어써도 안전"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if not entry: return None
+            self.entries.move_to_end(key)
+            return bytes(self.pool.slots[entry['slot']]), entry['version']
+
+    def discard(self, key):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry: self.pool.release(entry['slot'])
+
+class ThumbnailScheduler:
+    """keys_fn() 이 돌려주는 키들을 라운드로빈으로 캡처.
+    1/fps 초마다 한 번 깨어나 frame_budget_ms 를 넘기기 전까지만 캡처하고 나머지는 다음 틱으로 넘긴다."""
+    def __init__(self, backend, cache, keys_fn, fps=4.0, frame_budget_ms=25.0, max_stale=5.0):
+        self.backend = backend
+        self.cache = cache
+        self.keys_fn = keys_fn
+        self.interval = 1.0 / fps
+        self.frame_budget = frame_budget_ms / 1000
+        self.max_stale = max_stale
+        self.cursor = 0
+        self.signatures = {}
+        self.last_capture = {}
+        self.stats = {'ticks': 0, 'captured': 0, 'skipped': 0, 'failed': 0, 'capture_ms': 0.0}
+        self.stop_event = None
+        self.thread = None
+
+    @property
+    def running(self):
+        return self.stop_event is not None and not self.stop_event.is_set()
+
+    def start(self):
+        """쓰레드마다 자기 stop_event 를 가지므로, stop() 직후 다시 start() 해도 이전 루프는 반드시 끝난다"""
+        if self.running: return self
+        if self.thread: self.thread.join()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._loop, args=(self.stop_event,), daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        if self.stop_event: self.stop_event.set()
+
+    def _due(self, key, now):
+        sig_fn = getattr(self.backend, 'signature', None)
+        if sig_fn is None: return True, None
+        sig = sig_fn(key)
+        # max_stale 이 지나면 서명이 같아도 다시 찍는다. 내용이 실제로 바뀌었는지는 cache.put 의 해시 비교가 판단
+        if sig != self.signatures.get(key) or now - self.last_capture.get(key, 0.0) >= self.max_stale:
+            return True, sig
+        return False, sig
+
+    def tick(self):
+        keys = list(self.keys_fn())
+        self.stats['ticks'] += 1
+        if not keys: return
+        for gone in set(self.signatures) - set(keys):
+            self.signatures.pop(gone, None); self.last_capture.pop(gone, None); self.cache.discard(gone)
+        start = time.perf_counter()
+        for n in range(len(keys)):
+            if time.perf_counter() - start >= self.frame_budget: break
+            key = keys[(self.cursor + n) % len(keys)]
+            now = time.time()
+            due, sig = self._due(key, now)
+            if not due:
+                self.stats['skipped'] += 1
+                continue
+            t0 = time.perf_counter()
+            try: frame = self.backend.capture(key)
+            except Exception: frame = None
+            self.stats['capture_ms'] += (time.perf_counter() - t0) * 1000
+            if frame is None:
+                self.stats['failed'] += 1
+                continue
+            self.cache.put(key, frame)
+            self.signatures[key] = sig
+            self.last_capture[key] = now
+            self.stats['captured'] += 1
+        else:
+            n = len(keys)
+        self.cursor = (self.cursor + n) % len(keys)
+
+    def _loop(self, stop_event):
+        while not stop_event.is_set():
+            started = time.perf_counter()
+            self.tick()
+            stop_event.wait(max(self.interval - (time.perf_counter() - started), 0.0))
+
+class FakeCaptureBackend:
+    """가짜 이미지 원본. step() 마다 dirty_ratio 비율의 창만 내용이 바뀐다 (테스트/벤치마크용)"""
+    def __init__(self, width, height, cost_ms=2.0, dirty_ratio=0.2):
+        self.width, self.height = width, height
+        self.cost = cost_ms / 1000
+        self.dirty_ratio = dirty_ratio
+        self.versions = {}
+        self.counter = 0
+
+    def signature(self, key):
+        return self.versions.get(key, 0)
+
+    def step(self, keys):
+        """dirty_ratio 비율의 창 내용을 바꿈"""
+        self.counter += 1
+        span = max(int(len(keys) * self.dirty_ratio), 1)
+        for key in keys[(self.counter * span) % len(keys):][:span]:
+            self.versions[key] = self.counter
+
+    def capture(self, key):
+        if self.cost: time.sleep(self.cost)
+        shade = hash((key, self.versions.get(key, 0))) & 0xFF
+        return bytes([shade, (shade * 3) & 0xFF, (shade * 7) & 0xFF, 0xFF]) * (self.width * self.height)
+
+def run_bench(windows, seconds, fps, budget_ms, cost_ms):
+    cache = ThumbnailCache(capacity=windows)
+    width, height = cache.size
+    backend = FakeCaptureBackend(width, height, cost_ms=cost_ms)
+    keys = list(range(1, windows + 1))
+    sched = ThumbnailScheduler(backend, cache, lambda: keys, fps=fps, frame_budget_ms=budget_ms)
+    sched.start()
+    end = time.time() + seconds
+    while time.time() < end:
+        backend.step(keys)
+        time.sleep(0.25)
+    sched.stop()
+    st = sched.stats
+    print(f"창 {windows}개, {seconds}초, {fps}fps, 예산 {budget_ms}ms/틱, 캡처 비용 {cost_ms}ms")
+    print(f"틱 {st['ticks']} | 캡처 {st['captured']} | 서명 동일로 건너뜀 {st['skipped']} | 실패 {st['failed']}")
+    print(f"캡처 평균 {st['capture_ms'] / max(st['captured'], 1):.2f}ms | 캐시 {cache.stats} | 메모리 {len(cache.pool.buffer) / 1024:.0f}KB")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="썸네일 캐시 벤치마크 (가짜 캡처 백엔드)")
+    sub = ap.add_subparsers(dest='command', required=True)
+    p = sub.add_parser('bench')
+    p.add_argument('--windows', type=int, default=50)
+    p.add_argument('--seconds', type=float, default=3.0)
+    p.add_argument('--fps', type=float, default=4.0)
+    p.add_argument('--budget-ms', type=float, default=25.0)
+    p.add_argument('--cost-ms', type=float, default=2.0)
+    args = ap.parse_args(argv)
+    run_bench(args.windows, args.seconds, args.fps, args.budget_ms, args.cost_ms)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())